@@ -6,7 +6,7 @@ Demonstra vazamento espectral com diferentes janelas
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy import signal as sig
+from scipy import fft, signal as sig
 
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
@@ -28,21 +28,17 @@ windows = {
     'Blackman': sig.windows.blackman(N)
 }
 
-# Frequências para plotagem
-freqs = np.fft.fftfreq(N, 1/fs)
-positive_freqs = freqs[:N//2]
+# Espectros unilaterais de todas as janelas: uma única rfft em lote
+# (janelas × N), só com as frequências ≥ 0
+positive_freqs = fft.rfftfreq(N, 1/fs)
+X_mag_all = np.abs(fft.rfft(x * np.stack(list(windows.values())), axis=-1,
+                            workers=-1)) / N
 
 # Criar figura
 fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 axes = axes.flatten()
 
-for idx, (name, window) in enumerate(windows.items()):
-    # Aplicar janela
-    x_windowed = x * window
-    
-    # Calcular FFT
-    X = np.fft.fft(x_windowed)
-    X_mag = np.abs(X[:N//2]) / N
+for idx, (name, X_mag) in enumerate(zip(windows, X_mag_all)):
     X_db = 20 * np.log10(X_mag + 1e-10)
     
     # Plotar
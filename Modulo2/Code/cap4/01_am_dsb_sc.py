@@ -7,6 +7,8 @@ Gera: Sinal modulante, portadora, sinal modulado e espectros
 import numpy as np
 import matplotlib.pyplot as plt
 
+from _spectrum import one_sided_spectrum, band_spectrum
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -27,17 +29,11 @@ m_t = Am * np.cos(2*np.pi*fm*t)
 c_t = Ac * np.cos(2*np.pi*fc*t)
 s_dsb_sc = Ac * m_t * np.cos(2*np.pi*fc*t)
 
-# Espectros (FFT)
-freq = np.fft.fftfreq(N, 1/fs)
-M_f = np.fft.fft(m_t)
-C_f = np.fft.fft(c_t)
-S_f = np.fft.fft(s_dsb_sc)
-
-# Apenas frequências positivas
-pos_freq = freq[:N//2]
-M_mag = np.abs(M_f[:N//2]) / N
-C_mag = np.abs(C_f[:N//2]) / N
-S_mag = np.abs(S_f[:N//2]) / N
+# Espectros: a mensagem na banda base; portadora e DSB-SC só na janela
+# exibida em torno de fc (chirp-Z, na mesma grade de fs/N)
+pos_freq, M_mag = one_sided_spectrum(m_t, fs)
+band_freq, (C_mag, S_mag) = band_spectrum(np.stack([c_t, s_dsb_sc]), fs,
+                                          fc - 2000, fc + 2000)
 
 # Criar figura
 fig = plt.figure(figsize=(14, 10))
@@ -72,11 +68,11 @@ ax3.grid(True, alpha=0.3)
 
 # Subplot 4: Espectro da portadora
 ax4 = fig.add_subplot(gs[1, 1])
-ax4.stem(pos_freq, C_mag, basefmt=' ', linefmt='r-', markerfmt='ro')
+ax4.stem(band_freq, C_mag, basefmt=' ', linefmt='r-', markerfmt='ro')
 ax4.set_xlabel('Frequência (Hz)')
 ax4.set_ylabel('|C(f)|')
 ax4.set_title('Espectro da Portadora')
-ax4.set_xlim([8000, 12000])
+ax4.set_xlim([fc - 2000, fc + 2000])
 ax4.grid(True, alpha=0.3)
 
 # Subplot 5: DSB-SC no tempo
@@ -95,11 +91,11 @@ ax5.grid(True, alpha=0.3)
 
 # Subplot 6: Espectro DSB-SC
 ax6 = fig.add_subplot(gs[2, 1])
-ax6.stem(pos_freq, S_mag, basefmt=' ', linefmt='g-', markerfmt='go')
+ax6.stem(band_freq, S_mag, basefmt=' ', linefmt='g-', markerfmt='go')
 ax6.set_xlabel('Frequência (Hz)')
 ax6.set_ylabel('|S(f)|')
 ax6.set_title('Espectro AM DSB-SC')
-ax6.set_xlim([8000, 12000])
+ax6.set_xlim([fc - 2000, fc + 2000])
 ax6.axvline(x=fc, color='r', linestyle=':', alpha=0.5, label='fc')
 ax6.axvline(x=fc-fm, color='b', linestyle='--', alpha=0.5, label='LSB')
 ax6.axvline(x=fc+fm, color='b', linestyle='--', alpha=0.5, label='USB')
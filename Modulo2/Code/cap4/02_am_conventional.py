@@ -7,6 +7,8 @@ Gera: Comparação de envelopes para μ = 0.5, 1.0 e 1.5 (supermodulação)
 import numpy as np
 import matplotlib.pyplot as plt
 
+from _spectrum import one_sided_spectrum
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -60,11 +62,7 @@ for idx, (mu, color, label) in enumerate(zip(modulation_indices, colors, labels)
     
     # Subplot: Espectro
     ax_freq = axes[idx, 1]
-    S_f = np.fft.fft(s_am)
-    N = len(t)
-    freq = np.fft.fftfreq(N, 1/fs)
-    pos_freq = freq[:N//2]
-    S_mag = np.abs(S_f[:N//2]) / N
+    pos_freq, S_mag = one_sided_spectrum(s_am, fs)
     
     color_code = color[0]
     ax_freq.stem(pos_freq, S_mag, basefmt=' ', linefmt=color_code+'-', markerfmt=color_code+'o')
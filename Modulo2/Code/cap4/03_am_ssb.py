@@ -8,6 +8,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import hilbert
 
+from _spectrum import one_sided_spectrum
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -38,17 +40,9 @@ s_dsb = Ac * m_t * c_I  # DSB-SC
 s_usb = (Ac/2) * (m_t * c_I - m_hat * c_Q)  # SSB-USB
 s_lsb = (Ac/2) * (m_t * c_I + m_hat * c_Q)  # SSB-LSB
 
-# Espectros
-freq = np.fft.fftfreq(N, 1/fs)
-pos_freq = freq[:N//2]
-
-DSB_f = np.fft.fft(s_dsb)
-USB_f = np.fft.fft(s_usb)
-LSB_f = np.fft.fft(s_lsb)
-
-DSB_mag = np.abs(DSB_f[:N//2]) / N
-USB_mag = np.abs(USB_f[:N//2]) / N
-LSB_mag = np.abs(LSB_f[:N//2]) / N
+# Espectros unilaterais (uma rfft para os três sinais)
+pos_freq, (DSB_mag, USB_mag, LSB_mag) = one_sided_spectrum(
+    np.stack([s_dsb, s_usb, s_lsb]), fs)
 
 # Criar figura
 fig = plt.figure(figsize=(14, 10))
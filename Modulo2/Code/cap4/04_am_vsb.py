@@ -8,6 +8,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import signal
 
+from _freq_mask import (frequency_mask, dsb_mask, ssb_mask, vsb_mask,
+                        bin_index)
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -22,23 +25,10 @@ N = 2048
 freq = np.fft.fftfreq(N, 1/fs)
 pos_freq = freq[:N//2]
 
-# Criar filtro VSB ideal
-H_vsb = np.zeros(N, dtype=complex)
-for i, f in enumerate(freq):
-    f_abs = np.abs(f)
-    if f_abs < fc - W:
-        H_vsb[i] = 0
-    elif fc - W <= f_abs < fc - f_vest:
-        # Transição linear (vestígio)
-        H_vsb[i] = (f_abs - (fc - W)) / (W - f_vest)
-    elif fc - f_vest <= f_abs < fc + W:
-        H_vsb[i] = 1
-    else:
-        H_vsb[i] = 0
-
-# Filtros para comparação
-H_dsb = np.where((pos_freq >= fc - W) & (pos_freq <= fc + W), 1, 0)
-H_ssb = np.where((pos_freq >= fc) & (pos_freq <= fc + W), 1, 0)
+# Filtros (máscaras definidas por segmentos, avaliadas em todo o vetor)
+H_vsb = frequency_mask(freq, vsb_mask(fc, W, f_vest))
+H_dsb = frequency_mask(pos_freq, dsb_mask(fc, W))
+H_ssb = frequency_mask(pos_freq, ssb_mask(fc, W, 'upper'))
 H_vsb_pos = np.abs(H_vsb[:N//2])
 
 # Criar figura
@@ -97,11 +87,8 @@ ax3.legend()
 
 # Verificar simetria: H(fc+f) + H(fc-f) = constante
 f_check = np.linspace(0, f_vest, 50)
-symmetry_sum = []
-for f in f_check:
-    idx_pos = np.argmin(np.abs(pos_freq - (fc + f)))
-    idx_neg = np.argmin(np.abs(pos_freq - (fc - f)))
-    symmetry_sum.append(H_vsb_pos[idx_pos] + H_vsb_pos[idx_neg])
+symmetry_sum = (H_vsb_pos[bin_index(pos_freq, fc + f_check)]
+                + H_vsb_pos[bin_index(pos_freq, fc - f_check)])
 
 ax3_twin = ax3.twinx()
 ax3_twin.plot(f_check/1000, symmetry_sum, 'r--', linewidth=1.5, alpha=0.7, 
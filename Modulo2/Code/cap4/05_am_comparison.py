@@ -8,6 +8,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import hilbert
 
+from _spectrum import one_sided_spectrum
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -31,13 +33,9 @@ s_dsb_sc = Ac * m_t * np.cos(2*np.pi*fc*t)
 s_am_conv = Ac * (1 + mu * m_t) * np.cos(2*np.pi*fc*t)
 s_ssb_usb = (Ac/2) * (m_t * np.cos(2*np.pi*fc*t) - m_hat * np.sin(2*np.pi*fc*t))
 
-# Espectros
-freq = np.fft.fftfreq(N, 1/fs)
-pos_freq = freq[:N//2]
-
-DSB_SC_f = np.abs(np.fft.fft(s_dsb_sc)[:N//2]) / N
-AM_Conv_f = np.abs(np.fft.fft(s_am_conv)[:N//2]) / N
-SSB_USB_f = np.abs(np.fft.fft(s_ssb_usb)[:N//2]) / N
+# Espectros unilaterais (uma rfft para os três sinais)
+pos_freq, (DSB_SC_f, AM_Conv_f, SSB_USB_f) = one_sided_spectrum(
+    np.stack([s_dsb_sc, s_am_conv, s_ssb_usb]), fs)
 
 # Figura principal: Espectros comparativos
 fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -8,6 +8,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.special import jv
 
+from _fm_bandwidth import bessel_table, containment_order
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -50,13 +52,17 @@ gs = fig2.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
 beta_values = [0.5, 1.0, 2.0, 5.0]
 titles = ['NBFM: β = 0.5', 'β = 1.0', 'β = 2.0', 'WBFM: β = 5.0']
 
+# Tabela Jn(β) e ordem com 98% da potência para todos os β de uma vez
+J_table = bessel_table(beta_values)
+orders_98 = containment_order(beta_values, 0.98)
+
 for idx, (beta, title) in enumerate(zip(beta_values, titles)):
     ax = fig2.add_subplot(gs[idx//2, idx%2])
     
     # Calcular componentes espectrais
     max_n = int(beta + 10)  # Incluir mais componentes
     n_values = np.arange(-max_n, max_n+1)
-    amplitudes = np.abs(jv(n_values, beta))
+    amplitudes = np.abs(J_table[idx, np.abs(n_values)])  # |J₋ₙ| = |Jₙ|
     
     # Plotar apenas componentes significativas (> 1%)
     significant = amplitudes > 0.01
@@ -81,13 +87,7 @@ for idx, (beta, title) in enumerate(zip(beta_values, titles)):
            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
     # Marcar significância de 98%
-    power_sum = 0
-    n_98 = 0
-    for n in range(max_n+1):
-        power_sum += jv(n, beta)**2 + (jv(-n, beta)**2 if n > 0 else 0)
-        if power_sum >= 0.98:
-            n_98 = n
-            break
+    n_98 = orders_98[idx]
     
     if n_98 > 0:
         ax.axvspan(-n_98, n_98, alpha=0.1, color='green')
@@ -111,10 +111,10 @@ beta_table = [0.5, 1.0, 2.0, 5.0, 10.0]
 n_table = range(11)
 table_data = []
 
-for beta in beta_table:
+for beta, J_row in zip(beta_table, bessel_table(beta_table, n_max=10)):
     row = [f'{beta:.1f}']
     for n in n_table:
-        val = jv(n, beta)
+        val = J_row[n]
         if abs(val) < 0.005:
             row.append('—')
         else:
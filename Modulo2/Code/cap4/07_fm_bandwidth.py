@@ -6,7 +6,9 @@ Gera: Regra de Carson, comparação NBFM/WBFM
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.special import jv
+
+from _fm_bandwidth import carson_bandwidth, power_bandwidth
+from _spectrum import band_spectrum
 
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
@@ -14,25 +16,22 @@ plt.rcParams['axes.grid'] = True
 # Gráfico 1: Regra de Carson
 fig1, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
-beta_range = np.linspace(0.1, 20, 100)
+beta_range = np.linspace(0.1, 20, 2000)
 
 # Largura de banda pela regra de Carson
-B_carson = 2 * (beta_range + 1)  # Normalizada por fm
-
-# Largura de banda precisa (98% da potência)
-B_precise = []
-for beta in beta_range:
-    # Encontrar n tal que soma de Jn^2 >= 0.98
-    power_sum = 0
-    n = 0
-    while power_sum < 0.98 and n < 100:
-        power_sum += jv(n, beta)**2 + (jv(-n, beta)**2 if n > 0 else 0)
-        n += 1
-    B_precise.append(2*n)
+B_carson = carson_bandwidth(beta_range)  # Normalizada por fm
+
+# Largura de banda precisa: ordem n_p que contém a fração p da potência,
+# para os três critérios de uma vez (tabela de Bessel β × n)
+criteria = np.array([0.90, 0.98, 0.99])
+B_criteria = power_bandwidth(beta_range, criteria)
+B_precise = B_criteria[1]
 
 # Plot 1: Comparação regra de Carson vs precisa
 ax1.plot(beta_range, B_carson, 'b-', linewidth=2.5, label='Regra de Carson: B ≈ 2(β+1)fₘ')
 ax1.plot(beta_range, B_precise, 'r--', linewidth=2, label='Largura precisa (98% potência)')
+ax1.plot(beta_range, B_criteria[0], 'm:', linewidth=1.5, label='90% potência')
+ax1.plot(beta_range, B_criteria[2], 'k:', linewidth=1.5, label='99% potência')
 ax1.set_xlabel('Índice de Modulação β')
 ax1.set_ylabel('Largura de Banda (normalizada por fₘ)')
 ax1.set_title('Regra de Carson vs Largura de Banda Precisa')
@@ -49,7 +48,7 @@ ax1.text(10, max(B_carson)*0.9, 'WBFM\n(β >> 1)', ha='center', fontsize=10,
         bbox=dict(boxstyle='round', facecolor='lightblue'))
 
 # Plot 2: Erro relativo
-erro = (np.array(B_precise) - B_carson) / B_carson * 100
+erro = (B_precise - B_carson) / B_carson * 100
 ax2.plot(beta_range, erro, 'g-', linewidth=2)
 ax2.set_xlabel('Índice de Modulação β')
 ax2.set_ylabel('Erro Relativo (%)')
@@ -89,13 +88,10 @@ beta_wb = 5.0
 delta_f_wb = beta_wb * fm
 s_wbfm = Ac * np.cos(2*np.pi*fc*t + beta_wb*np.sin(2*np.pi*fm*t))
 
-# Espectros
-N = len(t)
-freq = np.fft.fftfreq(N, 1/fs)
-pos_freq = freq[:N//2]
-
-NBFM_f = np.abs(np.fft.fft(s_nbfm)[:N//2]) / N
-WBFM_f = np.abs(np.fft.fft(s_wbfm)[:N//2]) / N
+# Espectros só em torno da portadora (chirp-Z), com passo de 25 Hz em vez
+# dos fs/N = 200 Hz da FFT
+pos_freq, (NBFM_f, WBFM_f) = band_spectrum(np.stack([s_nbfm, s_wbfm]), fs,
+                                           fc - 7000, fc + 7000, df=25)
 
 # Subplot 1: Mensagem
 ax1 = fig2.add_subplot(gs[0, :])
@@ -8,6 +8,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import signal
 
+from _pll import (linear_pll, nonlinear_pll, capture_range, hold_range,
+                  theoretical_ranges, lock_time as lock_time_pll)
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -78,20 +81,34 @@ ax4 = axes[1, 1]
 # Parâmetros típicos
 Kd = 1.0  # Ganho do detector de fase (V/rad)
 Kv = 10000  # Ganho do VCO (Hz/V)
-wn_values = 2*np.pi*np.logspace(2, 4, 50)  # Diferentes frequências naturais
-
-# Faixas de captura e lock
-f_lock = Kd * Kv / (2*np.pi) * np.ones_like(wn_values)  # Aproximação
-f_capture = np.sqrt(2 * Kd * Kv) / (2*np.pi) * np.ones_like(wn_values)  # Aproximação
-
-ax4.semilogx(wn_values/(2*np.pi), f_lock/1000, 'b-', linewidth=2.5, label='Lock Range')
-ax4.semilogx(wn_values/(2*np.pi), f_capture/1000, 'r-', linewidth=2.5, label='Capture Range')
-ax4.fill_between(wn_values/(2*np.pi), 0, f_capture/1000, alpha=0.2, color='red')
-ax4.set_xlabel('Frequência Natural do Loop (Hz)')
+K = 2*np.pi*Kd*Kv  # Ganho de malha (rad/s)
+zeta_r = 0.707
+fs_r = 500000
+fn_values = np.geomspace(300, 5000, 12)  # Diferentes frequências naturais
+wn_values = 2*np.pi*fn_values
+
+# Faixas medidas no PLL não linear (filtro atraso-avanço), todos os laços
+# e degraus de frequência simulados em lote
+df_grid = np.geomspace(50, 1.2*Kd*Kv, 80)
+f_lockin, f_pullin = capture_range(df_grid, zeta_r, wn_values, fs_r,
+                                   duration=0.04, K=K)
+f_hold = hold_range(zeta_r, wn_values, fs_r, f_max=1.2*Kd*Kv, duration=0.3,
+                    K=K)
+th_hold, th_lockin, th_pullin = theoretical_ranges(zeta_r, wn_values, K)
+
+ax4.semilogx(fn_values, f_hold/1000, 'bo-', linewidth=2, label='Lock (retenção)')
+ax4.semilogx(fn_values, f_pullin/1000, 'rs-', linewidth=2, label='Captura (pull-in, 40 ms)')
+ax4.semilogx(fn_values, f_lockin/1000, 'g^-', linewidth=2, label='Lock-in (sem escorregar)')
+ax4.semilogx(fn_values, th_hold/1000, 'b--', linewidth=1, alpha=0.6)
+ax4.semilogx(fn_values, th_pullin/1000, 'r--', linewidth=1, alpha=0.6)
+ax4.semilogx(fn_values, th_lockin/1000, 'g--', linewidth=1, alpha=0.6,
+             label='Aproximações teóricas')
+ax4.fill_between(fn_values, 0, f_pullin/1000, alpha=0.2, color='red')
+ax4.set_xlabel('Frequência Natural do Loop $f_n$ (Hz)')
 ax4.set_ylabel('Faixa de Frequência (kHz)')
 ax4.set_title('Faixas de Captura e Lock do PLL')
 ax4.grid(True, which='both', alpha=0.3)
-ax4.legend()
+ax4.legend(fontsize=8)
 
 plt.suptitle('PLL: Análise de Características e Desempenho', 
             fontsize=14, fontweight='bold')
@@ -99,6 +116,9 @@ plt.tight_layout()
 plt.savefig('../pll_analysis.pdf', bbox_inches='tight')
 plt.savefig('../pll_analysis.png', dpi=300, bbox_inches='tight')
 print("Figura salva: pll_analysis.pdf/png")
+for fn, h, pi_, li in zip(fn_values[::4], f_hold[::4], f_pullin[::4], f_lockin[::4]):
+    print(f"  fn = {fn:6.0f} Hz: lock {h:7.0f} Hz, captura {pi_:7.0f} Hz, "
+          f"lock-in {li:7.0f} Hz")
 plt.close()
 
 # Gráfico 2: Simulação de PLL travando no sinal
@@ -122,16 +142,14 @@ phi_in = 2*np.pi*kf_in*np.cumsum(m_t)/fs
 s_in = Ac * np.cos(2*np.pi*fc_in*t + phi_in)
 f_in = fc_in + kf_in * m_t
 
-# Simulação simplificada do PLL
-# VCO frequência segue entrada com atraso
-tau_pll = 0.001  # Constante de tempo do PLL (1 ms)
-alpha = 1 - np.exp(-1/(fs*tau_pll))
-f_vco = np.zeros_like(t)
-f_vco[0] = fc_in
+# PLL de 2ª ordem não linear (detector sin, filtro PI, NCO livre em fc_in)
+zeta_pll = 0.707
+fn_pll = 600  # Hz
+err_pll, df_nco, _ = nonlinear_pll(phi_in, zeta_pll, 2*np.pi*fn_pll, fs)
+f_vco = fc_in + df_nco
 
-for i in range(1, len(t)):
-    # VCO tenta seguir frequência de entrada
-    f_vco[i] = f_vco[i-1] + alpha * (f_in[i] - f_vco[i-1])
+# Modelo linearizado equivalente, para comparação
+f_lin, _ = linear_pll(f_in, zeta_pll, 2*np.pi*fn_pll, fs, x0=fc_in)
 
 error = f_in - f_vco
 
@@ -145,6 +163,7 @@ axes[0].set_xlim([0, T_sim*1000])
 
 # Plot 2: Frequência do VCO
 axes[1].plot(t*1000, f_vco/1000, 'r-', linewidth=2, label='Frequência VCO')
+axes[1].plot(t*1000, f_lin/1000, 'k:', linewidth=1.5, label='Modelo linear')
 axes[1].plot(t*1000, f_in/1000, 'b--', linewidth=1, alpha=0.5, label='Referência (entrada)')
 axes[1].set_ylabel('Frequência (kHz)')
 axes[1].set_title('Frequência do VCO (seguindo entrada)')
@@ -161,14 +180,15 @@ axes[2].grid(True, alpha=0.3)
 axes[2].axhline(y=0, color='k', linestyle='--', linewidth=1)
 axes[2].set_xlim([0, T_sim*1000])
 
-# Marcar região de lock
-lock_threshold = 50  # Hz
-locked = np.abs(error) < lock_threshold
-if np.any(locked):
-    lock_time = t[np.where(locked)[0][0]] * 1000
-    axes[2].axvspan(lock_time, T_sim*1000, alpha=0.2, color='green')
-    axes[2].text(T_sim*1000/2, max(error)*0.8, 'PLL Locked', ha='center',
-                bbox=dict(boxstyle='round', facecolor='lightgreen'))
+# Marcar região de lock (medida: erro de fase estabilizado após o degrau)
+after = t >= 0.005
+lock_time = 0.005 + float(lock_time_pll(err_pll[after], fs, tol=0.05))
+if np.isfinite(lock_time):
+    axes[2].axvspan(lock_time*1000, T_sim*1000, alpha=0.2, color='green')
+    axes[2].text((lock_time + T_sim)*1000/2, max(error)*0.8,
+                 f'PLL Locked\n(t = {lock_time*1000:.1f} ms)', ha='center',
+                 bbox=dict(boxstyle='round', facecolor='lightgreen'))
+    print(f"Tempo de aquisição medido: {(lock_time - 0.005)*1000:.2f} ms")
 
 plt.suptitle('PLL: Processo de Travamento (Lock) em Sinal FM', 
             fontsize=14, fontweight='bold')
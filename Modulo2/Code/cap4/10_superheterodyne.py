@@ -7,6 +7,8 @@ Gera: Conversão de frequência e espectros em cada estágio
 import numpy as np
 import matplotlib.pyplot as plt
 
+from _freq_mask import bin_index
+
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.grid'] = True
 
@@ -181,7 +183,7 @@ ax.grid(True, alpha=0.3)
 ax.legend()
 
 # Marcar rejeição
-rejection = H_rf[np.argmin(np.abs(freq - f_image))]
+rejection = H_rf[bin_index(freq, f_image)]
 ax.plot([f_image], [rejection], 'ro', markersize=10)
 ax.annotate(f'Rejeição: {-20*np.log10(rejection):.1f} dB',
            xy=(f_image, rejection), xytext=(f_image+5, rejection+0.2),
@@ -0,0 +1,75 @@
+"""
+Largura de banda FM (tom senoidal) para os scripts do Capítulo 4.
+
+As raias do sinal FM têm amplitude Jn(β), n = 0, ±1, ±2, … A tabela
+(β × n) de Bessel é calculada numa única chamada a jv e guardada em
+cache; a potência acumulada até a ordem k, J0² + 2 Σ_{n=1..k} Jn², sai
+de um cumsum, e a ordem que contém uma fração p da potência é achada
+para todos os β e todos os p de uma vez.
+
+Uso: from _fm_bandwidth import power_bandwidth, carson_bandwidth
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import jv
+
+# Ordens além de β incluídas na tabela (Jn(β) ≈ 0 para n ≫ β)
+EXTRA_ORDERS = 30
+
+
+def default_max_order(beta):
+    """Maior ordem tabelada para os índices β dados."""
+    return int(np.ceil(np.max(beta))) + EXTRA_ORDERS
+
+
+@lru_cache(maxsize=32)
+def _cached_table(betas, n_max):
+    table = jv(np.arange(n_max + 1)[None, :], np.array(betas)[:, None])
+    table.setflags(write=False)
+    return table
+
+
+def bessel_table(beta, n_max=None):
+    """
+    Matriz Jn(β) de forma (len(β), n_max + 1), para n = 0 … n_max.
+    Somente leitura (vem do cache); J₋ₙ(β) = (−1)ⁿ Jn(β).
+    """
+    beta = np.atleast_1d(np.asarray(beta, dtype=float))
+    if n_max is None:
+        n_max = default_max_order(beta)
+    return _cached_table(tuple(beta.tolist()), int(n_max))
+
+
+def cumulative_power(beta, n_max=None):
+    """Fração da potência nas raias |n| ≤ k, para k = 0 … n_max."""
+    power = bessel_table(beta, n_max)**2
+    power = np.concatenate((power[:, :1], 2 * power[:, 1:]), axis=1)
+    return np.cumsum(power, axis=1)
+
+
+def containment_order(beta, fraction=0.98, n_max=None):
+    """
+    Menor ordem k tal que as raias |n| ≤ k contêm `fraction` da potência.
+    `fraction` pode ser um array de critérios: o resultado tem forma
+    fraction.shape + (len(β),). Se a tabela não bastar, retorna n_max.
+    """
+    cum = cumulative_power(beta, n_max)
+    fraction = np.asarray(fraction, dtype=float)[..., None, None]
+    reached = cum >= fraction
+    return np.where(reached.any(axis=-1), reached.argmax(axis=-1),
+                    cum.shape[-1] - 1)
+
+
+def power_bandwidth(beta, fraction=0.98, n_max=None):
+    """
+    Largura de banda 2(k + 1)·fₘ (normalizada por fₘ), k = containment_order:
+    mesma convenção da regra de Carson, 2(β + 1).
+    """
+    return 2 * (containment_order(beta, fraction, n_max) + 1)
+
+
+def carson_bandwidth(beta):
+    """Regra de Carson, normalizada por fₘ: B ≈ 2(β + 1)."""
+    return 2 * (np.asarray(beta, dtype=float) + 1)
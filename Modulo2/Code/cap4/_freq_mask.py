@@ -0,0 +1,72 @@
+"""
+Máscaras de resposta em frequência para os scripts do Capítulo 4.
+
+Uma máscara é uma lista declarativa de segmentos [f_ini, f_fim) com ganho
+linear entre g_ini e g_fim, avaliada de uma vez sobre todo o vetor de
+frequências com np.select (fora dos segmentos o ganho é 0). Por padrão a
+máscara vale para |f|, como os filtros reais de AM.
+
+Também há a busca do bin de uma frequência em O(1) numa grade uniforme,
+no lugar de varreduras com np.argmin.
+
+Uso: from _freq_mask import vsb_mask, frequency_mask, bin_index
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+Segment = namedtuple('Segment', ['f_lo', 'f_hi', 'g_lo', 'g_hi'])
+
+
+def band(f_lo, f_hi, gain=1.0):
+    """Segmento de ganho constante em [f_lo, f_hi)."""
+    return Segment(f_lo, f_hi, gain, gain)
+
+
+def ramp(f_lo, f_hi, g_lo=0.0, g_hi=1.0):
+    """Segmento com ganho linear de g_lo (em f_lo) a g_hi (em f_hi)."""
+    return Segment(f_lo, f_hi, g_lo, g_hi)
+
+
+def frequency_mask(freq, segments, two_sided=True):
+    """
+    Avalia a máscara `segments` em `freq` (qualquer forma). Segmentos
+    sobrepostos: vale o primeiro da lista.
+    """
+    f = np.abs(freq) if two_sided else np.asarray(freq, dtype=float)
+    conds = [(f >= s.f_lo) & (f < s.f_hi) for s in segments]
+    gains = [s.g_lo + (s.g_hi - s.g_lo) * (f - s.f_lo) / (s.f_hi - s.f_lo)
+             for s in segments]
+    return np.select(conds, gains, default=0.0)
+
+
+def dsb_mask(fc, W):
+    """Passa-faixa DSB: [fc − W, fc + W]."""
+    return [band(fc - W, np.nextafter(fc + W, np.inf))]
+
+
+def ssb_mask(fc, W, sideband='upper'):
+    """Passa-faixa SSB: [fc, fc + W] (USB) ou [fc − W, fc] (LSB)."""
+    if sideband == 'upper':
+        return [band(fc, np.nextafter(fc + W, np.inf))]
+    return [band(fc - W, np.nextafter(fc, np.inf))]
+
+
+def vsb_mask(fc, W, f_vest):
+    """
+    Filtro VSB (banda lateral superior + vestígio): rampa linear de 0 em
+    fc − W até 1 em fc − f_vest, e ganho 1 até fc + W.
+    """
+    return [ramp(fc - W, fc - f_vest, 0.0, 1.0), band(fc - f_vest, fc + W)]
+
+
+def bin_index(freq_grid, f):
+    """
+    Índice do bin mais próximo de `f` (escalar ou array) numa grade
+    uniforme crescente `freq_grid` (linspace, rfftfreq, fftfreq[:N//2]),
+    por aritmética em vez de busca.
+    """
+    df = freq_grid[1] - freq_grid[0]
+    idx = np.rint((np.asarray(f) - freq_grid[0]) / df).astype(int)
+    return np.clip(idx, 0, len(freq_grid) - 1)
@@ -0,0 +1,417 @@
+"""
+Simulação de PLL para os scripts do Capítulo 4.
+
+- Caso linear (pequenos erros de fase): a malha fechada vira um filtro
+  IIR (bilinear de H(s)) aplicado com scipy.signal.lfilter, com estado
+  inicial/final explícito para processar sinais longos em blocos e
+  varrer (ζ, ωn) em lote.
+- Caso não linear (detector de fase sin(·)): kernel por blocos, no
+  domínio da fase, com o estado (fase do NCO e integrador do filtro)
+  carregado entre blocos. A recursão amostra a amostra é compilada com
+  numba quando ele está instalado (opcional); sem ele, cada passo é
+  vetorizado sobre todos os cenários simulados juntos.
+- Registros longos: nonlinear_pll_stats percorre a entrada em blocos e
+  guarda só estatísticas por bloco (mínimo/máximo/extremos do erro e o
+  estado no início do bloco), sem os arrays amostra a amostra; é o que
+  acquisition, capture_range e hold_range usam.
+
+Convenção de ganhos (malha normalizada, Kd·Kv = 1):
+1ª ordem: ω_vco = ωn · e;  2ª ordem (PI): ω_vco = 2ζωn · e + ωn² ∫ e.
+Com ganho de malha K = 2π·Kd·Kv finito, o filtro de 2ª ordem é o
+atraso-avanço passivo F(s) = (1 + sτ2)/(1 + sτ1), com τ1 = K/ωn² e
+τ2 = 2ζ/ωn − 1/K, o que torna finitas as faixas de lock e de captura.
+
+Medidas (sobre lotes de cenários): tempo de aquisição, escorregamentos
+de ciclo, faixa de lock-in/pull-in (degrau de frequência) e faixa de
+retenção (rampa de frequência).
+
+Uso: from _pll import linear_pll, nonlinear_pll, capture_range
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy import signal
+
+try:
+    from numba import njit
+except ImportError:     # numba é opcional: sem ele, laço vetorizado em numpy
+    njit = None
+
+# Estado do kernel não linear: fase do NCO (rad) e integrador (rad/s)
+PLLState = namedtuple('PLLState', ['phase', 'integrator'])
+Acquisition = namedtuple('Acquisition', ['lock_time', 'slips'])
+# Estatísticas por bloco do erro de fase, forma (blocos,) + lote; phase e
+# integrator são o estado no início de cada bloco
+PLLBlockStats = namedtuple('PLLBlockStats', ['err_min', 'err_max',
+                                             'err_first', 'err_last',
+                                             'phase', 'integrator'])
+
+# Amostras por bloco no kernel não linear
+BLOCK_SAMPLES = 4096
+
+# Elementos (cenários × amostras) por bloco nas medidas em fluxo
+STATS_ELEMENTS = 1 << 20
+
+
+def closed_loop_tf(zeta, wn, order=2):
+    """Numerador e denominador de H(s) = θ_vco(s)/θ_in(s)."""
+    if order == 1:
+        return [wn], [1.0, wn]
+    return [2 * zeta * wn, wn**2], [1.0, 2 * zeta * wn, wn**2]
+
+
+def loop_sections(zeta, wn, fs, order=2):
+    """Coeficientes (b, a) discretos (transformação bilinear) da malha."""
+    b, a = closed_loop_tf(zeta, wn, order)
+    return signal.bilinear(b, a, fs)
+
+
+def linear_pll(x, zeta, wn, fs, order=2, zi=None, x0=None):
+    """
+    Resposta do PLL linearizado a `x` (fase ou frequência de entrada; a
+    mesma H(s) relaciona as duas grandezas).
+
+    zeta e wn podem ser arrays (são combinados por broadcast); a saída
+    tem forma broadcast(zeta, wn).shape + x.shape. `zi` é o estado de um
+    bloco anterior; sem ele, o filtro parte em regime com entrada `x0`
+    (padrão: a primeira amostra de x). Retorna (y, zf).
+    """
+    x = np.asarray(x, dtype=float)
+    zeta, wn = np.broadcast_arrays(np.asarray(zeta, dtype=float),
+                                   np.asarray(wn, dtype=float))
+    y = np.empty(zeta.shape + x.shape)
+    zf = None
+    for idx in np.ndindex(zeta.shape):
+        b, a = loop_sections(zeta[idx], wn[idx], fs, order)
+        if zi is None:
+            start = x[..., :1] if x0 is None else np.asarray(x0, dtype=float)
+            z = signal.lfilter_zi(b, a) * start
+        else:
+            z = zi[idx]
+        y[idx], z = signal.lfilter(b, a, x, zi=z)
+        if zf is None:
+            zf = np.empty(zeta.shape + z.shape)
+        zf[idx] = z
+    return y, zf
+
+
+def initial_state(shape=()):
+    """Estado inicial do kernel não linear (NCO em fase zero)."""
+    return PLLState(np.zeros(shape), np.zeros(shape))
+
+
+def _pll_loop_numpy(theta, phase, integ, kp, ki_dt, keep, dt, err, omega):
+    """
+    Recursão do PLL sobre lotes achatados (B, n), vetorizada em B. phase e
+    integ (B,) são atualizados no lugar; err e omega recebem a saída.
+    """
+    for k in range(theta.shape[1]):
+        e = theta[:, k] - phase
+        pd = np.sin(e)
+        integ *= keep
+        integ += ki_dt * pd
+        w = kp * pd + integ
+        phase += w * dt
+        err[:, k] = e
+        omega[:, k] = w
+
+
+def _pll_loop_scalar(theta, phase, integ, kp, ki_dt, keep, dt, err, omega):
+    """Mesma recursão de _pll_loop_numpy, escalar (para compilar com numba)."""
+    for b in range(theta.shape[0]):
+        p = phase[b]
+        acc = integ[b]
+        for k in range(theta.shape[1]):
+            e = theta[b, k] - p
+            pd = np.sin(e)
+            acc = acc * keep[b] + ki_dt[b] * pd
+            w = kp[b] * pd + acc
+            p += w * dt
+            err[b, k] = e
+            omega[b, k] = w
+        phase[b] = p
+        integ[b] = acc
+
+
+_pll_loop = (_pll_loop_numpy if njit is None
+             else njit(cache=True, nogil=True)(_pll_loop_scalar))
+
+
+def _flat(x, batch):
+    """Cópia contígua float de x (broadcast para `batch`), achatada."""
+    return np.array(np.broadcast_to(x, batch), dtype=float).reshape(-1)
+
+
+def nonlinear_pll_block(theta_in, state, kp, ki, fs, leak=0.0):
+    """
+    Processa um bloco do PLL não linear no domínio da fase.
+
+    theta_in: fase de entrada relativa ao NCO livre, forma (..., n);
+    kp, ki: ganhos proporcional e integral (broadcast com `...`);
+    leak: fuga do integrador (1/τ1 no filtro atraso-avanço; 0 no PI).
+    Retorna (erro de fase, desvio de frequência do NCO em Hz, novo
+    estado); o erro é e[n] = θ_in[n] − θ_nco[n].
+    """
+    theta_in = np.asarray(theta_in, dtype=float)
+    n = theta_in.shape[-1]
+    batch = np.broadcast_shapes(theta_in.shape[:-1], np.shape(state.phase),
+                                np.shape(kp), np.shape(ki), np.shape(leak))
+    theta = np.ascontiguousarray(
+        np.broadcast_to(theta_in, batch + (n,))).reshape(-1, n)
+    phase = _flat(state.phase, batch)
+    integ = _flat(state.integrator, batch)
+    ki_dt = _flat(ki, batch) / fs
+    keep = 1.0 - _flat(leak, batch) / fs
+
+    err = np.empty_like(theta)
+    omega = np.empty_like(theta)
+    _pll_loop(theta, phase, integ, _flat(kp, batch), ki_dt, keep, 1.0 / fs,
+              err, omega)
+    omega /= 2 * np.pi
+    return (err.reshape(batch + (n,)), omega.reshape(batch + (n,)),
+            PLLState(phase.reshape(batch), integ.reshape(batch)))
+
+
+def pll_gains(zeta, wn, order=2, K=None):
+    """
+    Ganhos (kp, ki, leak) do filtro de malha para o ζ e ωn dados.
+    K=None: integrador ideal (PI); K finito: atraso-avanço passivo.
+    """
+    zeta, wn = np.broadcast_arrays(np.asarray(zeta, dtype=float),
+                                   np.asarray(wn, dtype=float))
+    if order == 1:
+        return wn, np.zeros_like(wn), np.zeros_like(wn)
+    if K is None:
+        return 2 * zeta * wn, wn**2, np.zeros_like(wn)
+    tau1 = K / wn**2
+    tau2 = 2 * zeta / wn - 1.0 / K
+    if np.any(tau2 < 0):
+        raise ValueError("ωn grande demais para o ganho K (τ2 < 0)")
+    return K * tau2 / tau1, K * (1 - tau2 / tau1) / tau1, 1.0 / tau1
+
+
+def nonlinear_pll(theta_in, zeta, wn, fs, order=2, K=None, state=None,
+                  block=BLOCK_SAMPLES):
+    """
+    PLL não linear (detector sin(·), filtro de malha de ordem `order` e
+    NCO) aplicado a theta_in (..., n), processado em blocos de `block`
+    amostras. zeta/wn em array simulam vários laços de uma vez.
+    Retorna (erro de fase, desvio de frequência do NCO em Hz, estado).
+    """
+    theta_in = np.asarray(theta_in, dtype=float)
+    kp, ki, leak = pll_gains(zeta, wn, order, K)
+    batch = np.broadcast_shapes(theta_in.shape[:-1], kp.shape)
+    if state is None:
+        state = initial_state(batch)
+
+    n = theta_in.shape[-1]
+    err = np.empty(batch + (n,))
+    freq = np.empty(batch + (n,))
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        err[..., start:stop], freq[..., start:stop], state = \
+            nonlinear_pll_block(theta_in[..., start:stop], state, kp, ki, fs,
+                                leak)
+    return err, freq, state
+
+
+def wrap_phase(x):
+    """Fase reduzida a [−π, π)."""
+    return (np.asarray(x) + np.pi) % (2 * np.pi) - np.pi
+
+
+def _stats_block(block, batch):
+    """Amostras por bloco: `block`, ou o bastante para STATS_ELEMENTS."""
+    if block is not None:
+        return block
+    return max(1, STATS_ELEMENTS // max(1, int(np.prod(batch))))
+
+
+def _blocks(theta_fn, n, kp, ki, leak, fs, state, block):
+    """Gera (início, erro de fase, estado no início) de cada bloco."""
+    for start in range(0, n, block):
+        k = np.arange(start, min(start + block, n))
+        err, _, new = nonlinear_pll_block(theta_fn(k), state, kp, ki, fs, leak)
+        yield start, err, state
+        state = new
+
+
+def nonlinear_pll_stats(theta_fn, n, zeta, wn, fs, order=2, K=None,
+                        block=None):
+    """
+    Percorre n amostras do PLL não linear guardando só PLLBlockStats. A
+    entrada vem de theta_fn(k): fase nas amostras inteiras k (shape (m,)
+    ou lote + (m,)), gerada bloco a bloco — nem ela nem o erro completo
+    ficam na memória. block=None: blocos de até STATS_ELEMENTS elementos.
+    """
+    kp, ki, leak = pll_gains(zeta, wn, order, K)
+    batch = np.broadcast_shapes(np.shape(theta_fn(np.arange(1)))[:-1],
+                                kp.shape)
+    block = _stats_block(block, batch)
+    fields = [[] for _ in PLLBlockStats._fields]
+    for _, err, state in _blocks(theta_fn, n, kp, ki, leak, fs,
+                                 initial_state(batch), block):
+        # Cópias dos extremos: uma view manteria o bloco inteiro vivo
+        for acc, value in zip(fields, (err.min(axis=-1), err.max(axis=-1),
+                                       err[..., 0].copy(),
+                                       err[..., -1].copy(),
+                                       state.phase, state.integrator)):
+            acc.append(value)
+    return PLLBlockStats(*(np.array(v) for v in fields))
+
+
+def lock_time(err, fs, tol=0.1, settle=0.1):
+    """
+    Instante (s) a partir do qual o erro de fase fica a menos de `tol` rad
+    (módulo 2π) do seu valor final — o erro estático com desvio de
+    frequência não conta como falta de trava. Se o erro ainda varia na
+    fração final `settle` do registro, o laço não travou: retorna inf.
+    """
+    err = np.asarray(err)
+    unlocked = np.abs(wrap_phase(err - err[..., -1:])) >= tol
+    n = unlocked.shape[-1]
+    last = n - 1 - np.argmax(unlocked[..., ::-1], axis=-1)
+    t_lock = np.where(unlocked.any(axis=-1), (last + 1) / fs, 0.0)
+    settled = last < n - int(settle * n)
+    return np.where(settled | ~unlocked.any(axis=-1), t_lock, np.inf)
+
+
+def cycle_slips(err):
+    """Número de ciclos escorregados (2π) entre o início e o fim."""
+    err = np.asarray(err)
+    return np.rint(np.abs(err[..., -1] - err[..., 0]) / (2 * np.pi)).astype(int)
+
+
+def _last_unlocked(stats, theta_fn, n, kp, ki, leak, fs, block, tol):
+    """
+    Índice da última amostra com |e − e_final| ≥ tol (módulo 2π), ou −1,
+    a partir das estatísticas por bloco. Um bloco cujo [mínimo, máximo]
+    cabe em (e_final + 2πm − tol, e_final + 2πm + tol) para algum m está
+    todo travado; o último bloco que não está é re-simulado a partir do
+    estado guardado (mesmo kernel, mesmo resultado) para achar o índice
+    exato.
+    """
+    batch = stats.err_last.shape[1:]
+    flat = lambda v: v.reshape(len(v), -1)
+    final = flat(stats.err_last)[-1]
+    # Margem: o teste por bloco nunca aceita o que o teste exato recusa
+    band = tol * (1 - 1e-9)
+    m = np.floor((flat(stats.err_max) - final - band) / (2 * np.pi)) + 1
+    candidate = final + 2 * np.pi * m >= flat(stats.err_min) + band
+    phase, integ = flat(stats.phase), flat(stats.integrator)
+    kp, ki, leak = (_flat(v, batch) for v in (kp, ki, leak))
+
+    last = np.full(final.shape, -1)
+    pending = candidate.any(axis=0)
+    offsets = np.arange(block)
+    while pending.any():
+        rows = np.nonzero(pending)[0]
+        b = len(candidate) - 1 - np.argmax(candidate[::-1, rows], axis=0)
+        k = (b * block)[:, None] + offsets
+        # theta_fn gera o lote inteiro; só as linhas pendentes são usadas
+        start = np.zeros(final.shape, dtype=int)
+        start[rows] = b * block
+        theta = np.broadcast_to(
+            theta_fn(start.reshape(batch)[..., None] + offsets),
+            batch + (block,)).reshape(-1, block)[rows]
+        state = PLLState(phase[b, rows], integ[b, rows])
+        err, _, _ = nonlinear_pll_block(theta, state, kp[rows], ki[rows], fs,
+                                        leak[rows])
+        unlocked = ((np.abs(wrap_phase(err - final[rows, None])) >= tol)
+                    & (k < n))
+        found = unlocked.any(axis=-1)
+        last_k = k[:, -1] - np.argmax(unlocked[:, ::-1], axis=-1)
+        last[rows[found]] = last_k[found]
+        pending[rows[found]] = False
+        # Bloco sem amostra fora da faixa: tenta o candidato anterior
+        miss = rows[~found]
+        candidate[b[~found], miss] = False
+        pending[miss] = candidate[:, miss].any(axis=0)
+    return last.reshape(batch)
+
+
+def acquisition(delta_f, zeta, wn, fs, duration, order=2, K=None, tol=0.1,
+                settle=0.1, block=None):
+    """
+    Aquisição após um degrau de frequência `delta_f` (Hz) em t = 0, com o
+    NCO livre na frequência nominal. Todos os parâmetros são combinados por
+    broadcast e simulados em um único lote, em blocos: só as estatísticas
+    por bloco ficam na memória (ver nonlinear_pll_stats). O critério de
+    trava é o de lock_time.
+    Retorna Acquisition(lock_time em s, escorregamentos de ciclo).
+    """
+    delta_f = np.asarray(delta_f, dtype=float)
+    n = int(round(duration * fs))
+    theta_fn = lambda k: 2 * np.pi * delta_f[..., None] * (k / fs)
+    kp, ki, leak = pll_gains(zeta, wn, order, K)
+    block = _stats_block(block, np.broadcast_shapes(delta_f.shape, kp.shape))
+    stats = nonlinear_pll_stats(theta_fn, n, zeta, wn, fs, order, K, block)
+
+    last = _last_unlocked(stats, theta_fn, n, kp, ki, leak, fs, block, tol)
+    t_lock = np.where(last >= 0, (last + 1) / fs, 0.0)
+    settled = last < n - int(settle * n)
+    slips = np.rint(np.abs(stats.err_last[-1] - stats.err_first[0])
+                    / (2 * np.pi)).astype(int)
+    return Acquisition(np.where(settled | (last < 0), t_lock, np.inf), slips)
+
+
+def capture_range(delta_f, zeta, wn, fs, duration, order=2, K=None,
+                  tol=0.1, block=None):
+    """
+    Faixas medidas a partir de uma grade crescente de degraus `delta_f`
+    (último eixo), para cada laço (ζ, ωn) dos eixos anteriores:
+    lock-in = maior degrau da grade travado sem escorregar ciclos (e todos
+    os menores também); pull-in = maior degrau que trava dentro de
+    `duration`, com ou sem escorregamentos. Retorna (lock_in, pull_in)
+    em Hz.
+    """
+    delta_f = np.asarray(delta_f, dtype=float)
+    acq = acquisition(delta_f, np.asarray(zeta)[..., None],
+                      np.asarray(wn)[..., None], fs, duration, order, K, tol,
+                      block=block)
+    locked = np.isfinite(acq.lock_time)
+    clean = np.cumprod(locked & (acq.slips == 0), axis=-1).astype(bool)
+    grid = np.broadcast_to(delta_f, locked.shape)
+    lock_in = np.where(clean, grid, 0.0).max(axis=-1)
+    pull_in = np.where(locked, grid, 0.0).max(axis=-1)
+    return lock_in, pull_in
+
+
+def hold_range(zeta, wn, fs, f_max, duration, order=2, K=None,
+               block=None):
+    """
+    Faixa de retenção (lock) medida: partindo do laço travado, a
+    frequência de entrada sobe em rampa de 0 a `f_max` (Hz) em `duration`;
+    a faixa é o desvio em que ocorre o primeiro escorregamento de ciclo
+    (f_max se não houver). Simulado em blocos, parando assim que todos os
+    laços escorregaram.
+    """
+    n = int(round(duration * fs))
+    rate = f_max / duration
+    theta_fn = lambda k: np.pi * rate * (k / fs)**2
+    kp, ki, leak = pll_gains(zeta, wn, order, K)
+    first = np.full(kp.shape, -1)
+    for start, err, _ in _blocks(theta_fn, n, kp, ki, leak, fs,
+                                 initial_state(kp.shape),
+                                 _stats_block(block, kp.shape)):
+        slipped = np.abs(err) > np.pi
+        new = (first < 0) & slipped.any(axis=-1)
+        first[new] = start + np.argmax(slipped, axis=-1)[new]
+        if np.all(first >= 0):
+            break
+    return np.where(first >= 0, rate * (first / fs), f_max)
+
+
+def theoretical_ranges(zeta, wn, K):
+    """
+    Aproximações clássicas (Gardner) para o laço de 2ª ordem com filtro
+    atraso-avanço e ganho alto, em Hz: retenção K, lock-in 2ζωn e pull-in
+    (4√2/π)·√(ζωnK).
+    """
+    zeta, wn = np.broadcast_arrays(np.asarray(zeta, dtype=float),
+                                   np.asarray(wn, dtype=float))
+    hold = np.full(wn.shape, K / (2 * np.pi))
+    lock_in = 2 * zeta * wn / (2 * np.pi)
+    pull_in = 4 * np.sqrt(2) / np.pi * np.sqrt(zeta * wn * K) / (2 * np.pi)
+    return hold, lock_in, pull_in
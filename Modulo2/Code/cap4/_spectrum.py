@@ -0,0 +1,66 @@
+"""
+Espectro unilateral de sinais reais para os scripts do Capítulo 4.
+
+Usa rfft/rfftfreq (só as frequências ≥ 0, metade da memória da FFT
+complexa), opcionalmente completa com zeros até scipy.fft.next_fast_len
+(pad=True) e aceita lotes:
+vários sinais empilhados num array (..., N) viram uma única transformada,
+distribuída entre `workers` threads (a cota de processos da tarefa).
+
+Para ver só uma janela estreita (por exemplo, em torno da portadora),
+band_spectrum calcula apenas os bins em [f_lo, f_hi] pela transformada
+chirp-Z (scipy.signal.zoom_fft), com resolução livre e custo
+proporcional ao número de bins pedidos, não à banda toda.
+
+Uso: from _spectrum import one_sided_spectrum, band_spectrum
+"""
+
+import os
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import signal
+
+# Processos por tarefa definidos pelo generate_all_figures.py
+TASK_JOBS_ENV = 'PRICOM_TASK_JOBS'
+
+
+def one_sided_spectrum(x, fs, n=None, pad=False, workers=None):
+    """
+    Frequências (Hz) e magnitude |X(f)|/N do espectro unilateral do sinal
+    real `x` (último eixo; eixos anteriores são um lote de sinais).
+
+    n: comprimento da transformada (padrão: N = x.shape[-1]). pad=True o
+    aumenta para o próximo tamanho rápido, o que muda o espaçamento dos
+    bins (tons deixam de cair exatamente num bin); por isso é opcional. A
+    normalização é sempre pelo número de amostras N, para a amplitude não
+    depender do preenchimento. workers: threads do scipy.fft (só ajudam
+    em lotes); None = o valor de PRICOM_TASK_JOBS, que o
+    generate_all_figures.py define para cada tarefa, ou todos os núcleos.
+    Retorna (freq, mag), com mag de forma (..., n//2 + 1).
+    """
+    if workers is None:
+        workers = int(os.environ.get(TASK_JOBS_ENV, 0)) or -1
+    x = np.asarray(x, dtype=float)
+    N = x.shape[-1]
+    n = N if n is None else int(n)
+    if pad:
+        n = sp_fft.next_fast_len(n, real=True)
+    X = sp_fft.rfft(x, n=n, axis=-1, workers=workers)
+    return sp_fft.rfftfreq(n, 1 / fs), np.abs(X) / N
+
+
+def band_spectrum(x, fs, f_lo, f_hi, df=None):
+    """
+    Magnitude |X(f)|/N só na faixa [f_lo, f_hi] (Hz), amostrada com passo
+    `df` (padrão: fs/N, a grade da FFT; menor = mais resolução). Aceita
+    lotes como one_sided_spectrum. Retorna (freq, mag).
+    """
+    x = np.asarray(x, dtype=float)
+    N = x.shape[-1]
+    df = fs / N if df is None else df
+    m = int(round((f_hi - f_lo) / df)) + 1
+    freq = f_lo + df * np.arange(m)
+    X = signal.zoom_fft(x, [freq[0], freq[-1]], m=m, fs=fs, endpoint=True,
+                        axis=-1)
+    return freq, np.abs(X) / N
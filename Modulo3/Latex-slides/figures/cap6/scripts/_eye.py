@@ -0,0 +1,108 @@
+"""
+Diagrama de olho por densidade (histograma 2-D) para os scripts do
+Capítulo 6.
+
+Em vez de desenhar cada traço de 2T como uma linha do matplotlib, o sinal
+é visto como uma matriz (traços × 2·sps) — uma visão com strides sobre o
+próprio vetor, sem cópias — e os traços são acumulados em um histograma
+(colunas = amostras dentro de 2T, linhas = faixas de amplitude). O tempo
+de renderização e o tamanho do PDF não dependem do número de traços.
+
+Uso: from _eye import eye_traces, eye_histogram, plot_eye
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from matplotlib.colors import LinearSegmentedColormap, PowerNorm
+
+# Traços processados por vez ao acumular o histograma (limita a memória)
+_CHUNK_TRACES = 4096
+
+
+def eye_traces(sig, sps, start=0, n_traces=None, span=2):
+    """
+    Visão (somente leitura, sem cópia) de `sig` como matriz de traços:
+    a linha k contém sig[(start + k)·sps : (start + k + span)·sps].
+
+    Se `sig` tiver eixos extras à esquerda (um sinal por linha), a visão
+    tem forma (..., traços, span·sps).
+    """
+    seg = span * sps
+    view = sliding_window_view(np.asarray(sig), seg, axis=-1)
+    view = view[..., start * sps::sps, :]
+    if n_traces is not None:
+        view = view[..., :n_traces, :]
+    return view
+
+
+def _accumulate(traces, hist, y_range):
+    """Soma as contagens de `traces` em `hist` (ny × seg), no lugar."""
+    ny, seg = hist.shape
+    y_min, y_max = y_range
+    scale = ny / (y_max - y_min)
+    cols = np.arange(seg)
+    for i in range(0, len(traces), _CHUNK_TRACES):
+        chunk = traces[i:i + _CHUNK_TRACES]
+        rows = np.floor((chunk - y_min) * scale).astype(np.intp)
+        inside = (rows >= 0) & (rows < ny)
+        flat = (rows * seg + cols)[inside]
+        hist += np.bincount(flat, minlength=ny * seg).reshape(ny, seg)
+    return hist
+
+
+def eye_histogram(sig, sps, y_range, ny=200, start=0, n_traces=None,
+                  span=2, hist=None):
+    """
+    Histograma 2-D do diagrama de olho de `sig`.
+
+    Retorna (hist, t_edges, y_edges), com hist de forma (ny, span·sps):
+    hist[j, m] conta os traços cuja amostra m cai na faixa de amplitude j.
+    Passando um `hist` existente, as contagens são somadas a ele.
+    """
+    traces = eye_traces(sig, sps, start, n_traces, span)
+    if hist is None:
+        hist = np.zeros((ny, span * sps), dtype=np.int64)
+    _accumulate(traces, hist, y_range)
+    t_edges = np.arange(span * sps + 1) / sps
+    y_edges = np.linspace(y_range[0], y_range[1], hist.shape[0] + 1)
+    return hist, t_edges, y_edges
+
+
+def eye_histogram_blocks(blocks, sps, y_range, ny=200, skip=0, span=2):
+    """
+    Versão em fluxo de eye_histogram: consome blocos consecutivos do sinal
+    (por exemplo, de shape_symbol_blocks) e acumula todos os traços
+    completos, inclusive os que cruzam a fronteira entre blocos. Os
+    primeiros `skip` símbolos (transitório do filtro) são descartados.
+    """
+    seg = span * sps
+    hist = np.zeros((ny, seg), dtype=np.int64)
+    carry = np.zeros(0)
+    skip_samples = skip * sps
+    for block in blocks:
+        buf = np.concatenate((carry, block))
+        if skip_samples:
+            dropped = min(skip_samples, len(buf))
+            buf = buf[dropped:]
+            skip_samples -= dropped
+        if len(buf) < seg:
+            carry = buf
+            continue
+        n_traces = (len(buf) - seg) // sps + 1
+        _accumulate(eye_traces(buf, sps, span=span), hist, y_range)
+        carry = buf[n_traces * sps:]
+    t_edges = np.arange(seg + 1) / sps
+    y_edges = np.linspace(y_range[0], y_range[1], ny + 1)
+    return hist, t_edges, y_edges
+
+
+def plot_eye(ax, hist, t_edges, y_edges, color, gamma=0.5):
+    """
+    Desenha o histograma do olho em `ax` como imagem rasterizada, com
+    escala de cor de branco até `color` (gamma < 1 realça traços raros).
+    """
+    cmap = LinearSegmentedColormap.from_list('eye', ['white', color])
+    return ax.imshow(hist, origin='lower', aspect='auto', cmap=cmap,
+                     extent=(t_edges[0], t_edges[-1], y_edges[0], y_edges[-1]),
+                     norm=PowerNorm(gamma, vmin=0, vmax=max(hist.max(), 1)),
+                     interpolation='nearest', rasterized=True)
@@ -0,0 +1,194 @@
+"""
+Métricas de abertura do olho para os scripts do Capítulo 6.
+
+Recebe os traços de 2T produzidos por _eye.eye_traces (saída do caminho de
+formatação de pulso em _pulse_shaping) e mede, de uma vez sobre todos os
+traços: abertura vertical (altura), abertura horizontal (largura), fase
+ótima de amostragem, fator Q, jitter dos cruzamentos de limiar e o
+histograma desses cruzamentos.
+
+Todas as funções aceitam eixos extras à esquerda nos traços, de modo que
+uma varredura em α (ou em ruído) é uma única operação em lote.
+
+Uso: from _eye_metrics import eye_metrics, rolloff_sweep
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+from _eye import eye_traces
+from _pulse_shaping import rc_taps
+
+EyeMetrics = namedtuple('EyeMetrics',
+                        ['height', 'width', 'phase', 'q_factor', 'jitter_rms',
+                         'jitter_hist'])
+
+# Bins do histograma de jitter em [0, 1) T
+JITTER_BINS = 50
+
+# Sinais formatados por lote na varredura em α (limita a memória)
+_SWEEP_CHUNK = 16
+
+
+def _decision_thresholds(levels):
+    """Limiares de decisão (pontos médios entre níveis adjacentes)."""
+    levels = np.sort(np.asarray(levels, dtype=float))
+    return (levels[1:] + levels[:-1]) / 2
+
+
+def eye_opening(traces, sps, levels):
+    """
+    Abertura vertical e fator Q em cada fase (coluna) dos traços.
+
+    Cada traço é associado ao nível decidido no instante nominal do
+    símbolo central (coluna sps). Para cada par de níveis adjacentes, a
+    abertura numa fase é min(traços do nível superior) − max(traços do
+    nível inferior), e Q = (μ_sup − μ_inf)/(σ_sup + σ_inf); vale o pior
+    par. Retorna (height, q) com forma (..., 2·sps).
+    """
+    thresholds = _decision_thresholds(levels)
+    x = np.asarray(traces, dtype=float)
+    decision = np.digitize(x[..., sps], thresholds)[..., None]
+    height = np.full(x.shape[:-2] + x.shape[-1:], np.inf)
+    q = np.full_like(height, np.inf)
+
+    groups = []
+    for g in range(len(thresholds) + 1):
+        mask = np.broadcast_to(decision == g, x.shape)
+        n = mask.sum(axis=-2)
+        mean = np.where(mask, x, 0.0).sum(axis=-2) / np.maximum(n, 1)
+        var = np.where(mask, (x - mean[..., None, :])**2, 0.0).sum(axis=-2)
+        groups.append((mask, n, mean, np.sqrt(var / np.maximum(n, 1))))
+
+    for (m_lo, n_lo, mu_lo, sd_lo), (m_hi, n_hi, mu_hi, sd_hi) in \
+            zip(groups[:-1], groups[1:]):
+        top_of_lower = np.where(m_lo, x, -np.inf).max(axis=-2)
+        bottom_of_upper = np.where(m_hi, x, np.inf).min(axis=-2)
+        # Um nível sem nenhum traço não limita a abertura
+        present = (n_lo > 0) & (n_hi > 0)
+        pair_height = np.where(present, bottom_of_upper - top_of_lower, np.inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pair_q = np.where(present, (mu_hi - mu_lo) / (sd_hi + sd_lo),
+                              np.inf)
+        height = np.minimum(height, pair_height)
+        q = np.minimum(q, pair_q)
+    return height, q
+
+
+def threshold_crossings(traces, sps, levels):
+    """
+    Instantes (em T, dobrados em [0, 1)) em que os traços cruzam algum
+    limiar de decisão, por interpolação linear entre amostras.
+
+    Retorna (times, valid): arrays de forma (..., traços, limiares,
+    span·sps − 1), com `valid` marcando onde houve cruzamento.
+    """
+    thresholds = _decision_thresholds(levels)
+    x = np.asarray(traces, dtype=float)[..., None, :]
+    th = thresholds[:, None]
+    a, b = x[..., :-1] - th, x[..., 1:] - th
+    valid = (a * b < 0)
+    frac = np.divide(a, a - b, out=np.zeros(np.broadcast(a, b).shape),
+                     where=valid)
+    k = np.arange(x.shape[-1] - 1)
+    times = np.mod((k + frac) / sps, 1.0)
+    return times, valid
+
+
+def _crossing_histogram(times, valid, bins):
+    """
+    Contagens por bin dos instantes válidos, um histograma por índice dos
+    eixos de lote (tudo antes de traços × limiares × amostras): um único
+    bincount com o bin deslocado pela linha do lote.
+    """
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    batch = times.shape[:-3]
+    rows = int(np.prod(batch))
+    idx = np.clip(np.searchsorted(edges, times, side='right') - 1, 0,
+                  bins - 1).reshape(rows, -1)
+    flat = idx + bins * np.arange(rows)[:, None]
+    counts = np.bincount(flat[valid.reshape(rows, -1)],
+                         minlength=rows * bins)
+    return counts.reshape(batch + (bins,)), edges
+
+
+def jitter_histogram(traces, sps, levels, bins=JITTER_BINS):
+    """
+    Histograma dos instantes de cruzamento de limiar (em T), um por caso
+    dos eixos de lote. Retorna (contagens de forma (..., bins), bordas).
+    """
+    times, valid = threshold_crossings(traces, sps, levels)
+    return _crossing_histogram(times, valid, bins)
+
+
+def eye_metrics(traces, sps, levels, bins=JITTER_BINS):
+    """
+    Métricas do olho para traços de forma (..., traços, 2·sps).
+
+    height: abertura vertical na fase ótima (negativa se o olho fechou);
+    width: abertura horizontal em T (fases contíguas com olho aberto);
+    phase: fase ótima de amostragem em T, medida do início do traço;
+    q_factor: fator Q na fase ótima;
+    jitter_rms: desvio padrão dos instantes de cruzamento de limiar, em T;
+    jitter_hist: contagens desses instantes em `bins` bins de [0, 1) T,
+    forma (..., bins).
+    """
+    traces = np.asarray(traces)
+    height, q = eye_opening(traces, sps, levels)
+
+    # A fase ótima é procurada no símbolo central do traço de 2T
+    cols = np.arange(height.shape[-1])
+    central = (cols >= sps // 2) & (cols < sps // 2 + sps)
+    best = np.where(central, height, -np.inf).argmax(axis=-1)
+    best_height = np.take_along_axis(height, best[..., None], -1)[..., 0]
+    best_q = np.take_along_axis(q, best[..., None], -1)[..., 0]
+
+    # Largura: fases abertas contíguas em torno da fase ótima
+    closed = height <= 0
+    left = np.where(closed & (cols < best[..., None]), cols, -1).max(axis=-1)
+    right = np.where(closed & (cols > best[..., None]), cols,
+                     len(cols)).min(axis=-1)
+    width = np.where(best_height > 0, (right - left - 1) / sps, 0.0)
+
+    times, valid = threshold_crossings(traces, sps, levels)
+    n = valid.sum(axis=(-3, -2, -1))
+    mean = np.where(valid, times, 0.0).sum(axis=(-3, -2, -1)) / np.maximum(n, 1)
+    dev = np.where(valid, times - mean[..., None, None, None], 0.0)
+    jitter = np.sqrt((dev**2).sum(axis=(-3, -2, -1)) / np.maximum(n, 1))
+
+    hist, _ = _crossing_histogram(times, valid, bins)
+
+    return EyeMetrics(best_height, width, best / sps, best_q, jitter, hist)
+
+
+def rolloff_sweep(symbols, alphas, sps, levels, noise_std=0.0, span=6,
+                  seed=None, bins=JITTER_BINS):
+    """
+    Métricas do olho para cada roll-off em `alphas`, com os mesmos
+    símbolos e ruído AWGN de desvio `noise_std`.
+
+    Os sinais de vários α são formatados juntos (uma convolução FFT em
+    lote) e medidos de uma vez. Os traços afetados pelo transitório do
+    filtro (span símbolos em cada extremo) são descartados.
+    Retorna EyeMetrics com arrays de comprimento len(alphas) (jitter_hist:
+    (len(alphas), bins)).
+    """
+    rng = np.random.default_rng(seed)
+    symbols = np.asarray(symbols, dtype=float)
+    upsampled = np.zeros(len(symbols) * sps)
+    upsampled[::sps] = symbols
+    n_traces = len(symbols) - 4 * span
+
+    results = []
+    alphas = np.asarray(alphas, dtype=float)
+    for i in range(0, len(alphas), _SWEEP_CHUNK):
+        taps = np.stack([rc_taps(1.0, a, sps, span)
+                         for a in alphas[i:i + _SWEEP_CHUNK]])
+        sig = fftconvolve(upsampled[None, :], taps, axes=-1)
+        if noise_std > 0:
+            sig += noise_std * rng.standard_normal(sig.shape)
+        traces = eye_traces(sig, sps, start=2 * span, n_traces=n_traces)
+        results.append(eye_metrics(traces, sps, levels, bins))
+    return EyeMetrics(*(np.concatenate(field) for field in zip(*results)))
@@ -0,0 +1,220 @@
+"""
+Escalonador Monte Carlo com parada adaptativa para curvas de taxa de
+erro (BER/SER) dos scripts do Capítulo 6.
+
+Cada ponto da curva (por exemplo, um Eb/N0) é simulado em lotes
+independentes, distribuídos por um pool de processos. O lote j do ponto p
+usa a semente SeedSequence(seed).spawn(...)[p].spawn(...)[j], de modo que
+o resultado não depende da ordem em que os lotes terminam nem do número
+de processos. Um ponto para quando junta `target_errors` erros, quando o
+intervalo de confiança fica estreito o bastante ou ao atingir
+`max_trials`. O estado parcial pode ser gravado em disco e retomado.
+
+O estimador é uma função de nível de módulo (para poder ir ao pool)
+com assinatura estimator(point, n, rng) -> (erros, tentativas). Um
+estimador por amostragem por importância retorna
+(erros, amostras, Σ w·x, Σ (w·x)²): a taxa passa a ser a média ponderada
+e o critério de parada usa a variância estimada dessa média.
+
+Uso: from _montecarlo import run_error_rate
+"""
+
+import os
+import json
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+import numpy as np
+from scipy.stats import norm
+
+ErrorRate = namedtuple('ErrorRate',
+                       ['rate', 'errors', 'trials', 'ci_low', 'ci_high',
+                        'variance'])
+
+CHECKPOINT_VERSION = 2
+
+# Processos por tarefa definidos pelo generate_all_figures.py (jobs=None)
+TASK_JOBS_ENV = 'PRICOM_TASK_JOBS'
+
+
+def wilson_interval(errors, trials, confidence=0.95):
+    """Intervalo de confiança de Wilson para uma proporção."""
+    errors = np.asarray(errors, dtype=float)
+    trials = np.maximum(np.asarray(trials, dtype=float), 1)
+    z = norm.ppf(0.5 + confidence / 2)
+    p = errors / trials
+    denom = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return center - half, center + half
+
+
+def _batch_rng(seed, point_index, batch_index):
+    """Gerador do lote `batch_index` do ponto `point_index`."""
+    # Equivale a SeedSequence(seed).spawn(...)[point_index] depois de já
+    # ter gerado `batch_index` filhos
+    point_seq = np.random.SeedSequence(seed, spawn_key=(point_index,),
+                                       n_children_spawned=batch_index)
+    return np.random.default_rng(point_seq.spawn(1)[0])
+
+
+def _run_batch(estimator, point, n, seed, point_index, batch_index):
+    rng = _batch_rng(seed, point_index, batch_index)
+    result = estimator(point, n, rng)
+    if len(result) == 2:
+        errors, trials = result
+        return int(errors), int(trials), float(errors), float(errors), False
+    errors, trials, weighted, weighted_sq = result
+    return int(errors), int(trials), float(weighted), float(weighted_sq), True
+
+
+def _estimate(state, confidence):
+    """Taxa, intervalo de confiança e variância da estimativa de um ponto."""
+    trials = max(state['trials'], 1)
+    rate = state['weighted'] / trials
+    variance = max(state['weighted_sq'] / trials - rate**2, 0.0) / trials
+    if state['importance']:
+        half = norm.ppf(0.5 + confidence / 2) * np.sqrt(variance)
+        return rate, max(rate - half, 0.0), rate + half, variance
+    low, high = wilson_interval(state['errors'], state['trials'], confidence)
+    return rate, float(low), float(high), variance
+
+
+def _is_done(state, target_errors, rel_ci, confidence, max_trials):
+    """
+    Critério de parada de um ponto. Com amostragem por importância, os
+    erros observados vêm da distribuição enviesada e não medem a precisão,
+    então só valem o intervalo de confiança e o limite de tentativas.
+    """
+    if state['trials'] >= max_trials:
+        return True
+    if not state['importance'] and state['errors'] >= target_errors:
+        return True
+    if rel_ci is not None and state['errors'] > 0:
+        rate, low, high, _ = _estimate(state, confidence)
+        return (high - low) / 2 <= rel_ci * rate
+    return False
+
+
+def _next_batch(state, batch, max_batch, target_errors):
+    """
+    Tamanho do próximo lote: parte de `batch` e cresce geometricamente,
+    mirando o número de tentativas que a taxa estimada pede para chegar a
+    `target_errors`.
+    """
+    if state['batches'] == 0:
+        return batch
+    last = state['last_batch']
+    if state['errors'] == 0 or state['importance']:
+        return min(4 * last, max_batch)
+    needed = target_errors * state['trials'] / state['errors'] - state['trials']
+    return int(np.clip(needed, batch, min(4 * last, max_batch)))
+
+
+def _load_checkpoint(path, seed, points):
+    """Estado salvo dos pontos, se o checkpoint for desta simulação."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (data.get('version') != CHECKPOINT_VERSION or data.get('seed') != seed
+            or data.get('points') != json.loads(json.dumps(points))):
+        return None
+    return data['state']
+
+
+def _save_checkpoint(path, seed, points, states):
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+    path = Path(path)
+    data = {'version': CHECKPOINT_VERSION, 'seed': seed, 'points': points,
+            'state': states}
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    tmp.replace(path)
+
+
+def run_error_rate(estimator, points, seed=0, target_errors=100,
+                   rel_ci=None, confidence=0.95, max_trials=10**8,
+                   batch=10**4, max_batch=10**7, jobs=None,
+                   checkpoint=None):
+    """
+    Estima a taxa de erro em cada ponto de `points` (valores serializáveis
+    em JSON, passados ao estimador) até atingir o critério de parada.
+
+    jobs: número de processos (None = o valor de PRICOM_TASK_JOBS, que o
+    generate_all_figures.py define para cada tarefa, ou todos os núcleos;
+    1 = sem pool).
+    checkpoint: arquivo JSON para gravar o progresso a cada lote e
+    retomar uma execução interrompida com a mesma semente e pontos.
+    Retorna ErrorRate com arrays de comprimento len(points); `variance` é
+    a variância estimada de `rate` (para amostragem por importância, a
+    variância amostral da média ponderada).
+    """
+    points = list(points)
+    states = None
+    if checkpoint is not None:
+        states = _load_checkpoint(checkpoint, seed, points)
+    if states is None:
+        states = [{'errors': 0, 'trials': 0, 'weighted': 0.0,
+                   'weighted_sq': 0.0, 'importance': False, 'batches': 0,
+                   'last_batch': 0} for _ in points]
+
+    def done(i):
+        return _is_done(states[i], target_errors, rel_ci, confidence,
+                        max_trials)
+
+    def submit_args(i):
+        st = states[i]
+        n = _next_batch(st, batch, max_batch, target_errors)
+        n = min(n, max_trials - st['trials'])
+        return (estimator, points[i], n, seed, i, st['batches']), n
+
+    def update(i, n, result):
+        errors, trials, weighted, weighted_sq, importance = result
+        st = states[i]
+        st['errors'] += errors
+        st['trials'] += trials
+        st['weighted'] += weighted
+        st['weighted_sq'] += weighted_sq
+        st['importance'] = importance
+        st['batches'] += 1
+        st['last_batch'] = n
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, seed, points, states)
+
+    if jobs is None:
+        jobs = int(os.environ.get(TASK_JOBS_ENV, 0)) or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(points)))
+
+    if jobs == 1:
+        for i in range(len(points)):
+            while not done(i):
+                args, n = submit_args(i)
+                update(i, n, _run_batch(*args))
+    else:
+        with ProcessPoolExecutor(jobs) as pool:
+            running = {}
+            for i in range(len(points)):
+                if done(i):
+                    continue
+                args, n = submit_args(i)
+                running[pool.submit(_run_batch, *args)] = (i, n)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i, n = running.pop(future)
+                    update(i, n, future.result())
+                    if not done(i):
+                        args, n = submit_args(i)
+                        running[pool.submit(_run_batch, *args)] = (i, n)
+
+    errors = np.array([st['errors'] for st in states], dtype=np.int64)
+    trials = np.array([st['trials'] for st in states], dtype=np.int64)
+    # Sem pontos: arrays vazios (zip(*[]) não teria o que desempacotar)
+    estimates = np.array([_estimate(st, confidence) for st in states],
+                         dtype=float).reshape(len(states), 4)
+    rate, low, high, variance = estimates.T
+    return ErrorRate(rate, errors, trials, low, high, variance)
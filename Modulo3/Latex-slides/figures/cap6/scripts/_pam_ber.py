@@ -0,0 +1,191 @@
+"""
+Taxa de erro de bit (BER) e de símbolo (SER) do M-PAM em AWGN, para os
+scripts do Capítulo 6.
+
+Níveis a_m ∈ {±1, ±3, …, ±(M−1)} (como em gen_pam_constellation), com
+rótulos de bits em código Gray e decisão por mínima distância.
+
+- pam_ser_theory / pam_ber_theory: curvas fechadas via erfc. A BER é
+  exata: soma P(decidir j | enviado i) · d_H(i, j) sobre todos os pares.
+- simulate_pam: Monte Carlo em blocos de tamanho fixo (memória limitada),
+  avaliando toda a grade de Eb/N0 de uma vez em cada bloco.
+- pam_bit_errors / pam_bit_errors_is: estimadores para o escalonador de
+  _montecarlo; o segundo usa amostragem por importância para chegar a
+  BER de 10⁻⁹ em segundos.
+
+Uso: from _pam_ber import pam_ber_theory, simulate_pam
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.special import erfc
+
+PamErrors = namedtuple('PamErrors',
+                       ['ber', 'ser', 'bit_errors', 'symbol_errors',
+                        'n_symbols'])
+
+# Símbolos sorteados por bloco na simulação (memória ~ len(grade) · bloco)
+CHUNK_SYMBOLS = 1 << 16
+
+
+def q_function(x):
+    """Q(x) = ½ erfc(x/√2)."""
+    return 0.5 * erfc(np.asarray(x) / np.sqrt(2.0))
+
+
+def pam_levels(M):
+    """Níveis do M-PAM com distância 2 entre vizinhos."""
+    return np.linspace(-(M - 1), M - 1, M)
+
+
+def gray_labels(M):
+    """Rótulo Gray (inteiro de log2 M bits) de cada nível, do menor ao maior."""
+    n = np.arange(M)
+    return n ^ (n >> 1)
+
+
+def hamming_table(M):
+    """Matriz M×M com a distância de Hamming entre os rótulos Gray."""
+    g = gray_labels(M)
+    diff = g[:, None] ^ g[None, :]
+    k = int(np.log2(M))
+    return ((diff[..., None] >> np.arange(k)) & 1).sum(axis=-1)
+
+
+def noise_std(M, ebn0_db):
+    """Desvio padrão do ruído por amostra (σ² = N0/2) para o Eb/N0 dado."""
+    k = np.log2(M)
+    Es = (M**2 - 1) / 3.0
+    ebn0 = 10**(np.asarray(ebn0_db, dtype=float) / 10)
+    return np.sqrt(Es / k / ebn0 / 2.0)
+
+
+def pam_ser_theory(M, ebn0_db):
+    """P_s = 2(1 − 1/M) · Q(√(6 log2M/(M²−1) · Eb/N0))."""
+    return 2 * (1 - 1 / M) * q_function(1.0 / noise_std(M, ebn0_db))
+
+
+def pam_ber_theory(M, ebn0_db):
+    """BER exata do M-PAM com mapeamento Gray em AWGN."""
+    sigma = np.atleast_1d(noise_std(M, ebn0_db))[:, None, None]
+    levels = pam_levels(M)
+    edges = np.concatenate(([-np.inf], levels[:-1] + 1, [np.inf]))
+    s = levels[:, None]
+    # P(j | i) = Q((b_j − s_i)/σ) − Q((b_{j+1} − s_i)/σ); para regiões
+    # abaixo de s_i usa-se a forma espelhada, evitando 1 − (1 − ε)
+    above = q_function((edges[:-1] - s) / sigma) - q_function((edges[1:] - s) / sigma)
+    below = q_function((s - edges[1:]) / sigma) - q_function((s - edges[:-1]) / sigma)
+    p = np.where(edges[1:] <= s, below, above)
+    ber = (p * hamming_table(M)).sum(axis=(-2, -1)) / (M * np.log2(M))
+    return ber.reshape(np.shape(ebn0_db))
+
+
+def count_errors(M, ebn0_db, n_symbols, rng, chunk=CHUNK_SYMBOLS):
+    """
+    Erros de bit e de símbolo em `n_symbols` símbolos, para cada ponto de
+    `ebn0_db`. Cada bloco sorteia os símbolos e um único vetor de ruído
+    normalizado, escalado por σ de todos os pontos da grade de uma vez.
+    """
+    ebn0_db = np.atleast_1d(np.asarray(ebn0_db, dtype=float))
+    sigma = noise_std(M, ebn0_db)[:, None]
+    levels = pam_levels(M)
+    hamming = hamming_table(M)
+
+    bit_errors = np.zeros(len(ebn0_db), dtype=np.int64)
+    symbol_errors = np.zeros(len(ebn0_db), dtype=np.int64)
+    remaining = int(n_symbols)
+    while remaining > 0:
+        n = min(chunk, remaining)
+        tx = rng.integers(0, M, n)
+        r = levels[tx] + sigma * rng.standard_normal(n)
+        rx = np.clip(np.rint((r + (M - 1)) / 2), 0, M - 1).astype(np.intp)
+        symbol_errors += (rx != tx).sum(axis=1)
+        bit_errors += hamming[tx, rx].sum(axis=1)
+        remaining -= n
+    return bit_errors, symbol_errors
+
+
+def simulate_pam(M, ebn0_db, n_symbols, seed=None, chunk=CHUNK_SYMBOLS):
+    """BER e SER simuladas do M-PAM Gray em AWGN sobre a grade `ebn0_db`."""
+    rng = np.random.default_rng(seed)
+    bit_errors, symbol_errors = count_errors(M, ebn0_db, n_symbols, rng,
+                                             chunk)
+    k = np.log2(M)
+    return PamErrors(bit_errors / (n_symbols * k), symbol_errors / n_symbols,
+                     bit_errors, symbol_errors, n_symbols)
+
+
+def pam_bit_errors(point, n, rng):
+    """
+    Estimador para _montecarlo.run_error_rate: point = (M, Eb/N0 em dB);
+    transmite ⌈n / log2 M⌉ símbolos e retorna (erros de bit, bits).
+    """
+    M, ebn0_db = point
+    k = int(np.log2(M))
+    n_symbols = -(-int(n) // k)
+    bit_errors, _ = count_errors(M, ebn0_db, n_symbols, rng)
+    return bit_errors[0], n_symbols * k
+
+
+def _log_cosh(x):
+    """log(cosh(x)) sem overflow."""
+    x = np.abs(x)
+    return x + np.log1p(np.exp(-2 * x)) - np.log(2.0)
+
+
+def importance_noise(sigma, n, rng, method='shift', bias=None):
+    """
+    Ruído enviesado e pesos de verossimilhança w = p(ruído)/q(ruído), de
+    modo que E_q[w · 1{erro}] = P(erro) (estimativa não enviesada).
+
+    method='shift': mistura ½N(+μ, σ²) + ½N(−μ, σ²), empurrando o ruído
+    para os dois limiares vizinhos; μ = `bias` (padrão: 1, a distância
+    ao limiar). Peso: w = exp(μ²/2σ²) / cosh(μ·n/σ²).
+    method='scale': N(0, (c·σ)²) com c = `bias` (padrão: 1/σ, limitado
+    a ≥ 1). Peso: w = c · exp(−n²/2σ² · (1 − 1/c²)).
+    """
+    if method == 'shift':
+        mu = 1.0 if bias is None else bias
+        noise = sigma * rng.standard_normal(n)
+        noise += np.where(rng.random(n) < 0.5, mu, -mu)
+        log_w = mu**2 / (2 * sigma**2) - _log_cosh(mu * noise / sigma**2)
+    elif method == 'scale':
+        c = max(1.0, 1.0 / sigma) if bias is None else bias
+        noise = c * sigma * rng.standard_normal(n)
+        log_w = np.log(c) - noise**2 / (2 * sigma**2) * (1 - 1 / c**2)
+    else:
+        raise ValueError(f"método de amostragem desconhecido: {method!r}")
+    return noise, np.exp(log_w)
+
+
+def pam_bit_errors_is(point, n, rng, method='shift', bias=None,
+                      chunk=CHUNK_SYMBOLS):
+    """
+    Estimador por amostragem por importância para
+    _montecarlo.run_error_rate: point = (M, Eb/N0 em dB), n símbolos.
+
+    Retorna (erros de bit observados, símbolos, Σ x, Σ x²), onde
+    x = w · (bits errados)/log2 M é a contribuição de cada símbolo à BER.
+    """
+    M, ebn0_db = point
+    k = np.log2(M)
+    sigma = float(noise_std(M, ebn0_db))
+    levels = pam_levels(M)
+    hamming = hamming_table(M)
+
+    errors, total, total_sq = 0, 0.0, 0.0
+    remaining = int(n)
+    while remaining > 0:
+        m = min(chunk, remaining)
+        tx = rng.integers(0, M, m)
+        noise, w = importance_noise(sigma, m, rng, method, bias)
+        rx = np.clip(np.rint((levels[tx] + noise + (M - 1)) / 2),
+                     0, M - 1).astype(np.intp)
+        bits = hamming[tx, rx]
+        x = w * bits / k
+        errors += int(bits.sum())
+        total += x.sum()
+        total_sq += (x**2).sum()
+        remaining -= m
+    return errors, int(n), total, total_sq
@@ -2,7 +2,8 @@
 """
 Gera figuras de diagrama de olho e PAM M-ário para os slides.
 Saída: ../eye_diagram_clean.pdf, ../eye_diagram_isi.pdf,
-       ../pam4_constellation.pdf, ../pam_ber_comparison.pdf
+       ../pam4_constellation.pdf, ../pam_ber_comparison.pdf,
+       ../eye_metrics_rolloff.pdf
 
 Uso: python gen_eye_pam_figures.py
 """
@@ -10,6 +11,12 @@ Uso: python gen_eye_pam_figures.py
 import numpy as np
 import matplotlib.pyplot as plt
 
+from _eye import eye_histogram, eye_traces, plot_eye
+from _eye_metrics import eye_metrics, rolloff_sweep
+from _montecarlo import run_error_rate
+from _pam_ber import pam_ber_theory, pam_bit_errors, pam_bit_errors_is
+from _pulse_shaping import rc_taps, shape_symbols
+
 # ---------------------------------------------------------------------------
 # Configurações de estilo
 # ---------------------------------------------------------------------------
@@ -36,23 +43,6 @@ PURPLE    = '#8E44AD'
 TEAL      = '#16A085'
 
 
-def raised_cosine_time(t, T, alpha):
-    """Raised cosine pulse p(t) in time domain."""
-    p = np.zeros_like(t)
-    for i, ti in enumerate(t):
-        if abs(ti) < 1e-12:
-            p[i] = 1.0
-        elif alpha > 0 and abs(abs(ti) - T / (2 * alpha)) < 1e-12:
-            p[i] = (alpha / 2.0) * np.sinc(1.0 / (2 * alpha))
-        else:
-            denom = 1 - (2 * alpha * ti / T)**2
-            if abs(denom) < 1e-12:
-                p[i] = 0.0
-            else:
-                p[i] = np.sinc(ti / T) * np.cos(np.pi * alpha * ti / T) / denom
-    return p
-
-
 # ===========================================================================
 # Figura 1: Diagrama de olho — limpo (bom canal)
 # ===========================================================================
@@ -60,18 +50,14 @@ def gen_eye_diagram_clean():
     np.random.seed(42)
     T = 1.0
     alpha = 0.35
-    N_bits = 500
+    N_bits = 5000
     sps = 100  # samples per symbol
 
     bits = 2 * np.random.randint(0, 2, N_bits) - 1  # ±1
-    t_pulse = np.arange(-6*sps, 6*sps + 1) / sps * T
-    pulse = raised_cosine_time(t_pulse, T, alpha)
+    pulse = rc_taps(T, alpha, sps, span=6)
 
     # Generate signal
-    sig = np.zeros(N_bits * sps + len(t_pulse))
-    for i, b in enumerate(bits):
-        start = i * sps
-        sig[start:start + len(t_pulse)] += b * pulse
+    sig = shape_symbols(bits, pulse, sps)
 
     # Add small noise
     sig += 0.02 * np.random.randn(len(sig))
@@ -89,16 +75,10 @@ def gen_eye_diagram_clean():
         else:
             sig_noisy = sig.copy()
 
-        traces_per_eye = 150
-        segment_len = 2 * sps
-        t_eye = np.linspace(0, 2, segment_len)
-
-        for k in range(10, 10 + traces_per_eye):
-            start = k * sps
-            end = start + segment_len
-            if end < len(sig_noisy):
-                ax.plot(t_eye, sig_noisy[start:end], color=UNB_BLUE,
-                        linewidth=0.3, alpha=0.4)
+        # Eye diagram as 2-D histogram of all 2T traces
+        hist, t_edges, y_edges = eye_histogram(sig_noisy, sps, (-1.6, 1.6),
+                                               start=10, n_traces=N_bits - 20)
+        plot_eye(ax, hist, t_edges, y_edges, UNB_BLUE)
 
         ax.set_title(title, fontweight='bold')
         ax.set_xlabel(r'Tempo ($t / T$)', fontsize=11)
@@ -122,7 +102,7 @@ def gen_eye_diagram_clean():
 def gen_eye_diagram_rolloff():
     np.random.seed(42)
     T = 1.0
-    N_bits = 500
+    N_bits = 5000
     sps = 100
 
     bits = 2 * np.random.randint(0, 2, N_bits) - 1
@@ -132,26 +112,21 @@ def gen_eye_diagram_rolloff():
     fig, axes = plt.subplots(1, 4, figsize=(14, 3.5), sharey=True)
 
     for ax, alpha, col in zip(axes, alphas, colors):
-        t_pulse = np.arange(-6*sps, 6*sps + 1) / sps * T
-        pulse = raised_cosine_time(t_pulse, T, alpha)
+        pulse = rc_taps(T, alpha, sps, span=6)
 
-        sig = np.zeros(N_bits * sps + len(t_pulse))
-        for i, b in enumerate(bits):
-            start = i * sps
-            sig[start:start + len(t_pulse)] += b * pulse
+        sig = shape_symbols(bits, pulse, sps)
 
         sig += 0.03 * np.random.randn(len(sig))
 
-        traces = 120
-        segment_len = 2 * sps
-        t_eye = np.linspace(0, 2, segment_len)
+        hist, t_edges, y_edges = eye_histogram(sig, sps, (-1.6, 1.6),
+                                               start=10, n_traces=N_bits - 20)
+        plot_eye(ax, hist, t_edges, y_edges, col)
 
-        for k in range(10, 10 + traces):
-            start = k * sps
-            end = start + segment_len
-            if end < len(sig):
-                ax.plot(t_eye, sig[start:end], color=col,
-                        linewidth=0.3, alpha=0.4)
+        m = eye_metrics(eye_traces(sig, sps, start=10, n_traces=N_bits - 20),
+                        sps, [-1, 1])
+        ax.text(0.05, -1.5, f'h = {m.height:.2f}\nw = {m.width:.2f}T',
+                fontsize=8, va='bottom',
+                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
         ax.set_title(rf'$\alpha = {alpha}$', fontweight='bold')
         ax.set_xlabel(r'$t / T$', fontsize=11)
@@ -284,19 +259,15 @@ def gen_eye_diagram_4pam():
     np.random.seed(123)
     T = 1.0
     alpha = 0.35
-    N_syms = 500
+    N_syms = 5000
     sps = 100
     M = 4
     levels = np.array([-3, -1, 1, 3])
 
     symbols = levels[np.random.randint(0, M, N_syms)]
-    t_pulse = np.arange(-6*sps, 6*sps + 1) / sps * T
-    pulse = raised_cosine_time(t_pulse, T, alpha)
+    pulse = rc_taps(T, alpha, sps, span=6)
 
-    sig = np.zeros(N_syms * sps + len(t_pulse))
-    for i, s in enumerate(symbols):
-        start = i * sps
-        sig[start:start + len(t_pulse)] += s * pulse
+    sig = shape_symbols(symbols, pulse, sps)
 
     fig, axes = plt.subplots(1, 2, figsize=(10, 4.5))
 
@@ -306,16 +277,9 @@ def gen_eye_diagram_4pam():
         [r'(a) 4-PAM, pouco ruído', r'(b) 4-PAM, mais ruído ($\sigma=0.25$)']
     ):
         sig_noisy = sig + noise_level * np.random.randn(len(sig))
-        traces = 150
-        segment_len = 2 * sps
-        t_eye = np.linspace(0, 2, segment_len)
-
-        for k in range(10, 10 + traces):
-            start = k * sps
-            end = start + segment_len
-            if end < len(sig_noisy):
-                ax.plot(t_eye, sig_noisy[start:end], color=PURPLE,
-                        linewidth=0.3, alpha=0.35)
+        hist, t_edges, y_edges = eye_histogram(sig_noisy, sps, (-4.5, 4.5),
+                                               start=10, n_traces=N_syms - 20)
+        plot_eye(ax, hist, t_edges, y_edges, PURPLE)
 
         ax.set_title(title, fontweight='bold')
         ax.set_xlabel(r'$t / T$', fontsize=11)
@@ -333,6 +297,106 @@ def gen_eye_diagram_4pam():
     print("  [OK] eye_diagram_4pam.pdf")
 
 
+# ===========================================================================
+# Figura 6: Métricas do olho em função do roll-off
+# ===========================================================================
+def gen_eye_metrics_rolloff():
+    np.random.seed(42)
+    sps = 32
+    bits = 2 * np.random.randint(0, 2, 2000) - 1
+    alphas = np.linspace(0, 1, 201)
+
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+
+    for noise_std, ls in [(0.0, '-'), (0.1, '--')]:
+        m = rolloff_sweep(bits, alphas, sps, [-1, 1], noise_std=noise_std,
+                          seed=1)
+        lbl = 'sem ruído' if noise_std == 0 else rf'$\sigma = {noise_std}$'
+        axes[0].plot(alphas, m.width, color=UNB_BLUE, linestyle=ls,
+                     linewidth=2, label=f'Largura ({lbl})')
+        axes[0].plot(alphas, m.height / 2, color=UNB_GREEN, linestyle=ls,
+                     linewidth=2, label=f'Altura / 2 ({lbl})')
+        axes[1].plot(alphas, m.jitter_rms, color=RED, linestyle=ls,
+                     linewidth=2, label=lbl)
+
+    axes[0].set_title('(a) Abertura do olho', fontweight='bold')
+    axes[0].set_xlabel(r'Roll-off $\alpha$', fontsize=11)
+    axes[0].set_ylabel(r'Abertura (largura em $T$)', fontsize=11)
+    axes[0].set_ylim([0, 1.05])
+    axes[0].legend(fontsize=8)
+
+    axes[1].set_title('(b) Jitter nos cruzamentos de zero', fontweight='bold')
+    axes[1].set_xlabel(r'Roll-off $\alpha$', fontsize=11)
+    axes[1].set_ylabel(r'Jitter RMS ($T$)', fontsize=11)
+    axes[1].legend(fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig('../eye_metrics_rolloff.pdf', bbox_inches='tight')
+    plt.close()
+    print("  [OK] eye_metrics_rolloff.pdf")
+
+
+# ===========================================================================
+# Figura 7: BER do M-PAM — teoria vs. simulação
+# ===========================================================================
+def gen_pam_ber_comparison():
+    ebn0_fine = np.linspace(0, 24, 241)
+    ebn0_sim = np.arange(0, 25, 2.0)
+    orders = [2, 4, 8, 16]
+
+    # Monte Carlo adaptativo: cada ponto para com 100 erros de bit
+    points = [(M, e) for M in orders for e in ebn0_sim]
+    sim = run_error_rate(pam_bit_errors, points, seed=2024, target_errors=100,
+                         max_trials=2 * 10**6)
+    ber_sim = sim.rate.reshape(len(orders), len(ebn0_sim))
+    errors = sim.errors.reshape(len(orders), len(ebn0_sim))
+
+    # Cauda (poucos erros no Monte Carlo): amostragem por importância,
+    # até ±10% de incerteza relativa
+    tail = [p for p, e in zip(points, sim.errors) if e < 10]
+    ber_is = {}
+    if tail:
+        sim_is = run_error_rate(pam_bit_errors_is, tail, seed=2024,
+                                rel_ci=0.1, max_trials=10**6)
+        ber_is = dict(zip(tail, sim_is.rate))
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+
+    for i, (M, col, mk) in enumerate(zip(orders,
+                                         [UNB_BLUE, UNB_GREEN, RED, PURPLE],
+                                         ['o', 's', '^', 'D'])):
+        ax.semilogy(ebn0_fine, pam_ber_theory(M, ebn0_fine), color=col,
+                    linewidth=2, label=f'{M}-PAM (teoria)')
+        # Só pontos com erros suficientes para uma estimativa confiável
+        ok = errors[i] >= 10
+        ax.semilogy(ebn0_sim[ok], ber_sim[i, ok], linestyle='none', marker=mk,
+                    color=col, markerfacecolor='white', markersize=6)
+        e_is = ebn0_sim[~ok]
+        if len(e_is):
+            b_is = np.array([ber_is[(M, e)] for e in e_is])
+            ax.semilogy(e_is, b_is, linestyle='none', marker=mk, color=col,
+                        markersize=5)
+
+    ax.semilogy([], [], linestyle='none', marker='o', color='gray',
+                markerfacecolor='white', label='Monte Carlo')
+    if ber_is:
+        ax.semilogy([], [], linestyle='none', marker='o', color='gray',
+                    markersize=5, label='Amostragem por importância')
+    ax.set_xlabel(r'$E_b/N_0$ (dB)', fontsize=12)
+    ax.set_ylabel('BER', fontsize=12)
+    ax.set_title('Taxa de erro de bit do $M$-PAM (Gray) em AWGN',
+                 fontweight='bold')
+    ax.set_xlim([0, 24])
+    ax.set_ylim([1e-9, 0.5])
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend(fontsize=9, loc='lower left')
+
+    plt.tight_layout()
+    plt.savefig('../pam_ber_comparison.pdf', bbox_inches='tight')
+    plt.close()
+    print("  [OK] pam_ber_comparison.pdf")
+
+
 if __name__ == '__main__':
     print("Gerando figuras de diagrama de olho e PAM...")
     gen_eye_diagram_clean()
@@ -340,4 +404,6 @@ if __name__ == '__main__':
     gen_pam_constellation()
     gen_pam_waveforms()
     gen_eye_diagram_4pam()
+    gen_eye_metrics_rolloff()
+    gen_pam_ber_comparison()
     print("Concluído!\n")
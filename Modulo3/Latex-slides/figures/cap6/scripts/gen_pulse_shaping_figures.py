@@ -10,6 +10,8 @@ Uso: python gen_pulse_shaping_figures.py
 import numpy as np
 import matplotlib.pyplot as plt
 
+from _pulse_shaping import raised_cosine_time, raised_cosine_freq
+
 # ---------------------------------------------------------------------------
 # Configurações de estilo
 # ---------------------------------------------------------------------------
@@ -35,38 +37,6 @@ RED       = '#C0392B'
 PURPLE    = '#8E44AD'
 TEAL      = '#16A085'
 
-# ===========================================================================
-# Raised cosine pulse (time domain)
-# ===========================================================================
-def raised_cosine_time(t, T, alpha):
-    """Raised cosine pulse p(t) in time domain."""
-    p = np.zeros_like(t)
-    for i, ti in enumerate(t):
-        if abs(ti) < 1e-12:
-            p[i] = 1.0
-        elif alpha > 0 and abs(abs(ti) - T / (2 * alpha)) < 1e-12:
-            p[i] = (alpha / 2.0) * np.sinc(1.0 / (2 * alpha))
-        else:
-            p[i] = np.sinc(ti / T) * np.cos(np.pi * alpha * ti / T) / \
-                   (1 - (2 * alpha * ti / T)**2 + 1e-30)
-    return p
-
-
-def raised_cosine_freq(f, T, alpha):
-    """Raised cosine spectrum P(f)."""
-    P = np.zeros_like(f)
-    for i, fi in enumerate(f):
-        fi_abs = abs(fi)
-        if fi_abs <= (1 - alpha) / (2 * T):
-            P[i] = T
-        elif fi_abs <= (1 + alpha) / (2 * T):
-            P[i] = T / 2.0 * (1 + np.cos(np.pi * T / alpha *
-                    (fi_abs - (1 - alpha) / (2 * T))))
-        else:
-            P[i] = 0.0
-    return P
-
-
 # ===========================================================================
 # Figura 1: ISI illustration
 # ===========================================================================
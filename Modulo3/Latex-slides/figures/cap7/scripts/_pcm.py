@@ -0,0 +1,162 @@
+"""
+Codificador PCM em fluxo para os scripts do Capítulo 7:
+amostragem → companding/quantização → empacotamento de bits.
+
+A entrada (array de áudio ou arquivo WAV, lido com mmap) é percorrida em
+blocos de BLOCK_SAMPLES amostras, então a memória não depende da duração
+do sinal. Em cada bloco:
+
+1. amostragem: filtro anti-aliasing FIR (lfilter com estado entre blocos)
+   e decimação por um fator inteiro, mantendo a fase entre blocos;
+2. quantização: G.711 de 8 bits (law='mu' ou 'a', por tabela) ou
+   uniforme de n_bits (law='uniform');
+3. empacotamento: os códigos de n_bits viram um fluxo contínuo de bits
+   (np.packbits); os bits que sobram de um byte passam ao bloco seguinte.
+
+Cada bloco devolve os bytes gerados e a SQNR acumulada até ali (sinal
+amostrado vs. sinal decodificado).
+
+Uso: from _pcm import pcm_stream, encode_pcm, decode_pcm
+"""
+
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from scipy import signal
+from scipy.io import wavfile
+
+from _quantization import (g711_decode, g711_encode, uniform_decode,
+                           uniform_encode)
+
+PCMBlock = namedtuple('PCMBlock', ['payload', 'n_samples', 'sqnr_db'])
+PCMStats = namedtuple('PCMStats', ['fs', 'n_samples', 'n_bytes', 'sqnr_db',
+                                   'samples_per_s'])
+
+# Amostras de entrada por bloco
+BLOCK_SAMPLES = 1 << 16
+
+# Coeficientes do filtro anti-aliasing por fator de decimação
+_TAPS_PER_FACTOR = 16
+
+
+def read_source(source, fs=None):
+    """
+    (fs, amostras) de um array (fs obrigatório) ou de um arquivo WAV. O WAV
+    é aberto com mmap; inteiros são normalizados para [−1, 1) só quando
+    cada bloco é lido (ver blocks).
+    """
+    if isinstance(source, (str, Path)):
+        fs, data = wavfile.read(source, mmap=True)
+    elif fs is None:
+        raise ValueError("fs é obrigatório para entrada em array")
+    else:
+        data = np.asarray(source)
+    return fs, data
+
+
+def blocks(data, block=BLOCK_SAMPLES):
+    """Gera blocos float em [−1, 1) (mono: média dos canais)."""
+    scale, shift = 1.0, 0.0
+    if data.dtype == np.uint8:          # WAV de 8 bits é sem sinal
+        scale, shift = 1 / 128, -1.0
+    elif np.issubdtype(data.dtype, np.integer):
+        scale = 1.0 / (np.iinfo(data.dtype).max + 1)
+    for start in range(0, len(data), block):
+        x = np.asarray(data[start:start + block], dtype=float) * scale + shift
+        if x.ndim > 1:
+            x = x.mean(axis=1)
+        yield x
+
+
+def _pack(codes, n_bits, carry):
+    """Empacota códigos de n_bits; retorna (bytes, bits que sobraram)."""
+    if n_bits == 8 and len(carry) == 0:
+        return codes.astype(np.uint8), carry
+    shifts = np.arange(n_bits - 1, -1, -1)
+    bits = ((codes[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+    bits = np.concatenate((carry, bits))
+    n = len(bits) // 8 * 8
+    return np.packbits(bits[:n]), bits[n:]
+
+
+def _codec(law, n_bits):
+    """(codificador, decodificador) de amostras para códigos inteiros."""
+    if law in ('mu', 'a'):
+        if n_bits != 8:
+            raise ValueError("G.711 usa códigos de 8 bits")
+        return (lambda x: g711_encode(x, law),
+                lambda c: g711_decode(c, law))
+    if law == 'uniform':
+        return (lambda x: uniform_encode(x, n_bits),
+                lambda c: uniform_decode(c, n_bits))
+    raise ValueError(f"lei desconhecida: {law!r}")
+
+
+def pcm_stream(source, fs=None, law='mu', n_bits=8, decimation=1,
+               block=BLOCK_SAMPLES):
+    """
+    Gera PCMBlock(payload, n_samples, sqnr_db) para cada bloco da entrada:
+    payload são os bytes (np.uint8) produzidos no bloco, n_samples as
+    amostras codificadas e sqnr_db a SQNR acumulada. O último item inclui
+    os bits restantes, completados com zeros até o byte.
+    """
+    fs, data = read_source(source, fs)
+    encode, decode = _codec(law, n_bits)
+
+    if decimation > 1:
+        taps = signal.firwin(_TAPS_PER_FACTOR * decimation + 1, 1 / decimation)
+        zi = np.zeros(len(taps) - 1)
+    offset = 0   # posição da próxima amostra mantida, dentro do bloco
+    carry = np.zeros(0, dtype=np.uint8)
+    P_s = P_q = 0.0
+
+    for x in blocks(data, block):
+        if decimation > 1:
+            y, zi = signal.lfilter(taps, 1.0, x, zi=zi)
+            x = y[offset::decimation]
+            offset = (offset - len(y)) % decimation
+        codes = encode(x)
+        err = decode(codes) - x
+        P_s += np.dot(x, x)
+        P_q += np.dot(err, err)
+        payload, carry = _pack(codes, n_bits, carry)
+        yield PCMBlock(payload, len(x), 10 * np.log10(P_s / (P_q + 1e-30)))
+
+    if len(carry):
+        yield PCMBlock(np.packbits(carry), 0,
+                       10 * np.log10(P_s / (P_q + 1e-30)))
+
+
+def encode_pcm(source, out=None, fs=None, law='mu', n_bits=8, decimation=1,
+               block=BLOCK_SAMPLES):
+    """
+    Consome pcm_stream gravando os bytes em `out` (arquivo binário aberto
+    ou None para descartar) e mede a vazão.
+    Retorna PCMStats(fs de saída, amostras, bytes, SQNR em dB, amostras/s).
+    """
+    fs_in = read_source(source, fs)[0]
+    n_samples = n_bytes = 0
+    sqnr = np.nan
+    t0 = time.perf_counter()
+    for blk in pcm_stream(source, fs, law, n_bits, decimation, block):
+        if out is not None:
+            out.write(blk.payload.tobytes())
+        n_samples += blk.n_samples
+        n_bytes += len(blk.payload)
+        sqnr = blk.sqnr_db
+    elapsed = time.perf_counter() - t0
+    return PCMStats(fs_in / decimation, n_samples, n_bytes, sqnr,
+                    n_samples * decimation / max(elapsed, 1e-12))
+
+
+def decode_pcm(payload, n_samples, law='mu', n_bits=8):
+    """Bytes empacotados → n_samples amostras decodificadas."""
+    _, decode = _codec(law, n_bits)
+    payload = np.frombuffer(payload, dtype=np.uint8)
+    if n_bits == 8:
+        return decode(payload[:n_samples])
+    bits = np.unpackbits(payload)[:n_samples * n_bits].reshape(-1, n_bits)
+    codes = bits.astype(np.int64) @ (1 << np.arange(n_bits - 1, -1, -1))
+    return decode(codes)
@@ -0,0 +1,201 @@
+"""
+Quantização e companding para os scripts do Capítulo 7.
+
+- quantize_uniform / quantize_midrise / quantize_midtread: quantizadores
+  uniformes (saída no ponto médio do intervalo, ou com nível em zero);
+  uniform_encode / uniform_decode separam o código inteiro do nível.
+- mu_law_* / a_law_*: leis de compressão e expansão (μ = 255, A = 87,6).
+- g711_encode / g711_decode: PCM de 8 bits no estilo G.711 (μ-law e
+  A-law segmentadas). As tabelas de codificação (uma entrada por amostra
+  linear de 14/13 bits) e de decodificação (256 entradas) são montadas
+  uma vez; codificar e decodificar vira indexação inteira, sem log/exp.
+- sine_sqnr: SQNR de uma senoide em função do nível (dBFS), para as
+  quantizações uniforme, μ-law e A-law ao mesmo tempo.
+
+Em sine_sqnr a senoide é uma grade uniforme de fases sobre um período
+(amostras nos pontos médios), o que equivale a amostrar a distribuição
+de amplitudes da senoide (arco-seno) pelos seus quantis. A grade é
+percorrida em blocos de fases, com broadcast sobre (níveis × fases); cada
+bloco tem no máximo CHUNK_ELEMENTS elementos, então a memória não cresce
+com o número de níveis nem de amostras.
+
+Uso: from _quantization import quantize_uniform, g711_encode, sine_sqnr
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Elementos (níveis × fases) por bloco em sine_sqnr
+CHUNK_ELEMENTS = 1 << 18
+
+
+# ---------------------------------------------------------------------------
+# Quantizador uniforme e leis de compressão
+# ---------------------------------------------------------------------------
+def uniform_encode(x, n_bits, v_min=-1.0, v_max=1.0):
+    """Índice (código) do intervalo de quantização uniforme, 0 … 2ⁿ − 1."""
+    L     = 2**n_bits
+    delta = (v_max - v_min) / L
+    x_c   = np.clip(x, v_min, v_max - 1e-12)
+    idx   = np.floor((x_c - v_min) / delta).astype(int)
+    return np.clip(idx, 0, L - 1)
+
+def uniform_decode(idx, n_bits, v_min=-1.0, v_max=1.0):
+    """Ponto médio do intervalo de índice `idx`."""
+    delta = (v_max - v_min) / 2**n_bits
+    return v_min + (idx + 0.5) * delta
+
+def quantize_uniform(x, n_bits, v_min=-1.0, v_max=1.0):
+    """Quantizador uniforme — saída = ponto médio do intervalo."""
+    return uniform_decode(uniform_encode(x, n_bits, v_min, v_max), n_bits,
+                          v_min, v_max)
+
+def quantize_midrise(x, n_bits, v_max=1.0):
+    """Mid-rise simétrico em [−v_max, v_max): níveis em ±Δ/2, ±3Δ/2, …"""
+    return quantize_uniform(x, n_bits, -v_max, v_max)
+
+def quantize_midtread(x, n_bits, v_max=1.0):
+    """Mid-tread em [−v_max, v_max): níveis em 0, ±Δ, …, com Δ = 2·v_max/2ⁿ."""
+    L     = 2**n_bits
+    delta = 2 * v_max / L
+    idx   = np.clip(np.rint(np.asarray(x) / delta), -L//2, L//2 - 1)
+    return idx * delta
+
+def mu_law_compress(x, mu=255):
+    return np.sign(x) * np.log(1 + mu * np.abs(x)) / np.log(1 + mu)
+
+def mu_law_expand(y, mu=255):
+    return np.sign(y) * (1/mu) * ((1 + mu)**np.abs(y) - 1)
+
+def a_law_compress(x, A=87.6):
+    y    = np.zeros_like(x, dtype=float)
+    m1   = np.abs(x) <  1/A
+    m2   = np.abs(x) >= 1/A
+    y[m1] = np.sign(x[m1]) * A * np.abs(x[m1]) / (1 + np.log(A))
+    y[m2] = np.sign(x[m2]) * (1 + np.log(A * np.abs(x[m2]))) / (1 + np.log(A))
+    return y
+
+def a_law_expand(y, A=87.6):
+    x    = np.zeros_like(y, dtype=float)
+    lA   = np.log(A)
+    m1   = np.abs(y) <  1 / (1 + lA)
+    m2   = ~m1
+    x[m1] = np.sign(y[m1]) * np.abs(y[m1]) * (1 + lA) / A
+    x[m2] = np.sign(y[m2]) * np.exp(np.abs(y[m2]) * (1 + lA) - 1) / A
+    return x
+
+
+# ---------------------------------------------------------------------------
+# PCM de 8 bits G.711 (tabelas de consulta)
+# ---------------------------------------------------------------------------
+# Bits da amostra linear na entrada do codificador de cada lei
+G711_BITS = {'mu': 14, 'a': 13}
+
+
+def _g711_mu_encode(pcm):
+    """μ-law segmentada: amostras lineares de 14 bits → códigos de 8 bits."""
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    mag  = np.minimum(np.abs(pcm), 8159) + 0x21
+    seg  = np.searchsorted([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF],
+                           mag)
+    code = np.where(seg >= 8, 0x7F,
+                    (np.minimum(seg, 7) << 4) | ((mag >> (seg + 1)) & 0xF))
+    return (code ^ mask).astype(np.uint8)
+
+def _g711_mu_decode(code):
+    """Códigos μ-law → amostras lineares (escala de 16 bits)."""
+    u = ~code.astype(np.int32) & 0xFF
+    t = (((u & 0x0F) << 3) + 0x84) << ((u & 0x70) >> 4)
+    return np.where(u & 0x80, 0x84 - t, t - 0x84)
+
+def _g711_a_encode(pcm):
+    """A-law segmentada: amostras lineares de 13 bits → códigos de 8 bits."""
+    mask = np.where(pcm >= 0, 0xD5, 0x55)
+    mag  = np.where(pcm >= 0, pcm, -pcm - 1)
+    seg  = np.searchsorted([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF],
+                           mag)
+    mant = np.where(seg < 2, mag >> 1, mag >> np.maximum(seg, 1)) & 0xF
+    code = np.where(seg >= 8, 0x7F, (np.minimum(seg, 7) << 4) | mant)
+    return (code ^ mask).astype(np.uint8)
+
+def _g711_a_decode(code):
+    """Códigos A-law → amostras lineares (escala de 16 bits)."""
+    a   = code.astype(np.int32) ^ 0x55
+    seg = (a & 0x70) >> 4
+    t   = ((a & 0x0F) << 4) + np.where(seg == 0, 8, 0x108)
+    t   = t << np.maximum(seg - 1, 0)
+    return np.where(a & 0x80, t, -t)
+
+
+@lru_cache(maxsize=None)
+def g711_tables(law='mu'):
+    """
+    (codificação, decodificação) da lei G.711 `law`: a primeira indexada
+    pela amostra linear de G711_BITS bits deslocada para ≥ 0, a segunda
+    pelo código de 8 bits (saída em [−1, 1)). Somente leitura.
+    """
+    bits = G711_BITS[law]
+    pcm  = np.arange(-2**(bits - 1), 2**(bits - 1))
+    codes = np.arange(256, dtype=np.uint8)
+    if law == 'mu':
+        enc, dec = _g711_mu_encode(pcm), _g711_mu_decode(codes)
+    else:
+        enc, dec = _g711_a_encode(pcm), _g711_a_decode(codes)
+    dec = dec / 32768.0
+    enc.setflags(write=False)
+    dec.setflags(write=False)
+    return enc, dec
+
+def g711_encode(x, law='mu'):
+    """Amostras em [−1, 1) → códigos G.711 de 8 bits (np.uint8)."""
+    enc, _ = g711_tables(law)
+    half = 2**(G711_BITS[law] - 1)
+    idx  = np.clip(np.floor(np.asarray(x) * half), -half, half - 1)
+    return enc[idx.astype(np.intp) + half]
+
+def g711_decode(codes, law='mu'):
+    """Códigos G.711 de 8 bits → amostras em [−1, 1)."""
+    _, dec = g711_tables(law)
+    return dec[np.asarray(codes, dtype=np.uint8)]
+
+
+# Lei → (compressão, expansão); 'uniform' = sem companding
+COMPANDERS = {
+    'uniform': (None, None),
+    'mu':      (mu_law_compress, mu_law_expand),
+    'a':       (a_law_compress,  a_law_expand),
+}
+
+
+def companded_quantize(x, n_bits, law='uniform'):
+    """Comprime, quantiza uniformemente com n_bits e expande."""
+    compress, expand = COMPANDERS[law]
+    if compress is None:
+        return quantize_uniform(x, n_bits)
+    return expand(quantize_uniform(compress(x), n_bits))
+
+
+# ---------------------------------------------------------------------------
+# SQNR de uma senoide vs. nível
+# ---------------------------------------------------------------------------
+def sine_sqnr(level_dBFS, n_bits, laws=('uniform', 'mu', 'a'),
+              n_samples=1 << 16, chunk=CHUNK_ELEMENTS):
+    """
+    SQNR (dB) de uma senoide de amplitude de pico 10^(nível/20) para cada
+    nível de `level_dBFS` e cada lei de `laws`, com `n_samples` fases por
+    período. Retorna {lei: array com len(level_dBFS) valores}.
+    """
+    amp = 10**(np.asarray(level_dBFS, dtype=float) / 20)[:, None]
+    step = max(1, chunk // len(amp))
+
+    P_s = np.zeros(len(amp))
+    P_q = {law: np.zeros(len(amp)) for law in laws}
+    for start in range(0, n_samples, step):
+        phase = (np.arange(start, min(start + step, n_samples)) + 0.5) / n_samples
+        g = amp * np.sin(2*np.pi*phase)
+        P_s += (g**2).sum(axis=1)
+        for law in laws:
+            P_q[law] += ((companded_quantize(g, n_bits, law) - g)**2).sum(axis=1)
+
+    return {law: 10 * np.log10(P_s / (P_q[law] + 1e-30)) for law in laws}
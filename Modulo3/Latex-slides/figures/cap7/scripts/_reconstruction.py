@@ -0,0 +1,162 @@
+"""
+Reconstrução de sinais amostrados para os scripts do Capítulo 7.
+
+g(t) = Σ_n g[n] · h(t·fs − n), com o núcleo h de:
+- 'sinc': interpolação ideal (limitada em banda);
+- 'zoh':  segurador de ordem zero (h = 1 em [0, 1));
+- 'rc':   cosseno levantado com roll-off `alpha` (decai como 1/x³).
+
+Dois caminhos de cálculo, com o mesmo resultado:
+- direto: para cada instante, só as 2·span amostras vizinhas (núcleo
+  truncado), custo O(M·span) — bom para poucos pontos ou t arbitrário;
+- FFT: quando t é uma grade uniforme com passo Ts/L (L inteiro), as
+  amostras são sobreamostradas por L (zeros intercalados) e convoluídas
+  com o núcleo amostrado via fftconvolve, custo O(N·L log(N·L)).
+
+`path='auto'` escolhe o mais barato pelo tamanho. Nenhum dos dois monta a
+matriz N×M de sincs. span=None usa todas as amostras (soma exata para o
+registro finito).
+
+Uso: from _reconstruction import reconstruct, reconstruction_snr
+"""
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+# Meia largura padrão (em amostras) do núcleo de cosseno levantado
+RC_SPAN = 8
+
+# Elementos (instantes × amostras) por bloco no caminho direto
+CHUNK_ELEMENTS = 1 << 20
+
+# Custo de um ponto·log2 da FFT relativo a uma avaliação do núcleo no
+# caminho direto (medido: ~5 ns contra ~60 ns); calibra a escolha automática
+_FFT_COST = 0.1
+
+
+def _raised_cosine(x, alpha):
+    """Pulso cosseno levantado normalizado (T = 1) em x = t/T."""
+    x = np.asarray(x, dtype=float)
+    if alpha == 0:
+        return np.sinc(x)
+    den = 1 - (2 * alpha * x)**2
+    sing = np.abs(den) < 1e-10
+    safe = np.where(sing, 1.0, den)
+    return np.where(sing, np.pi / 4 * np.sinc(1 / (2 * alpha)),
+                    np.sinc(x) * np.cos(np.pi * alpha * x) / safe)
+
+
+def kernel(x, method='sinc', alpha=0.25):
+    """Núcleo de interpolação h(x), com x em períodos de amostragem."""
+    if method == 'sinc':
+        return np.sinc(x)
+    if method == 'zoh':
+        return ((x >= 0) & (x < 1)).astype(float)
+    if method == 'rc':
+        return _raised_cosine(x, alpha)
+    raise ValueError(f"método de reconstrução desconhecido: {method!r}")
+
+
+def _support(method, span, n, x):
+    """
+    Amostras usadas em cada instante x = t·fs: `before` até ⌊x⌋ (inclusive)
+    e `after` depois dele. Para 'sinc' sem span, o bastante para alcançar
+    todas as n amostras a partir de qualquer x.
+    """
+    if method == 'zoh':
+        return 1, 0
+    if span is None and method == 'sinc':
+        reach = max(0, -int(np.floor(x.min())), int(np.floor(x.max())) - n + 1)
+        return n + reach, n + reach
+    span = RC_SPAN if span is None else span
+    return span, span
+
+
+def _sample_positions(t, fs):
+    """x = t·fs, com instantes de amostragem arredondados ao inteiro exato."""
+    x = np.asarray(t, dtype=float) * fs
+    r = np.rint(x)
+    return np.where(np.abs(x - r) < 1e-9, r, x)
+
+
+def _uniform_grid(t, fs):
+    """(m0, L) se t = (m0 + k)/(L·fs), k = 0 … M−1, com L inteiro; senão None."""
+    if len(t) < 2:
+        return None
+    dt = t[1] - t[0]
+    L = int(round(1 / (fs * dt))) if dt > 0 else 0
+    if L < 1 or abs(L * fs * dt - 1) > 1e-9:
+        return None
+    m0 = t[0] * fs * L
+    if abs(m0 - round(m0)) > 1e-6 or not np.allclose(np.diff(t), dt,
+                                                     rtol=1e-9, atol=0):
+        return None
+    return int(round(m0)), L
+
+
+def _direct(g_n, fs, t, method, alpha, before, after):
+    """
+    Soma truncada: para cada instante, só as amostras vizinhas. Os
+    instantes são processados em blocos de no máximo CHUNK_ELEMENTS
+    (instantes × amostras), limitando a memória.
+    """
+    x = _sample_positions(t, fs)
+    offsets = np.arange(1 - before, after + 1)
+    rows = max(1, CHUNK_ELEMENTS // len(offsets))
+    out = np.empty(len(x))
+    for start in range(0, len(x), rows):
+        xb = x[start:start + rows]
+        n = np.floor(xb).astype(int)[:, None] + offsets
+        valid = (n >= 0) & (n < len(g_n))
+        h = kernel(xb[:, None] - n, method, alpha)
+        out[start:start + rows] = np.where(
+            valid, h * g_n[np.clip(n, 0, len(g_n) - 1)], 0.0).sum(axis=1)
+    return out
+
+
+def _fft(g_n, m0, M, L, method, alpha, before, after):
+    """Sobreamostragem por L + convolução FFT com o núcleo amostrado."""
+    up = np.zeros(len(g_n) * L)
+    up[::L] = g_n
+    # Núcleo em d = m − nL ∈ [−after·L, before·L): mesma janela do direto
+    d = np.arange(-after * L, before * L)
+    full = fftconvolve(up, kernel(d / L, method, alpha))
+    # full[i] corresponde a m = i − after·L
+    idx = np.arange(m0, m0 + M) + after * L
+    ok = (idx >= 0) & (idx < len(full))
+    out = np.zeros(M)
+    out[ok] = full[idx[ok]]
+    return out
+
+
+def reconstruct(g_n, fs, t, method='sinc', alpha=0.25, span=None,
+                path='auto'):
+    """
+    Reconstrói nos instantes `t` (s) o sinal de amostras `g_n` tomadas em
+    n/fs, n = 0 … N−1. span: meia largura do núcleo em amostras (None:
+    todas para 'sinc', RC_SPAN para 'rc'); path: 'direct', 'fft' ou 'auto'.
+    """
+    g_n = np.asarray(g_n, dtype=float)
+    t = np.asarray(t, dtype=float)
+    before, after = _support(method, span, len(g_n), _sample_positions(t, fs))
+    grid = _uniform_grid(t, fs)
+
+    if path == 'auto':
+        path = 'direct'
+        if grid is not None:
+            size = (len(g_n) + before + after) * grid[1]
+            if _FFT_COST * size * np.log2(size) < len(t) * (before + after):
+                path = 'fft'
+    if path == 'fft':
+        if grid is None:
+            raise ValueError("caminho FFT exige t uniforme com passo Ts/L")
+        return _fft(g_n, grid[0], len(t), grid[1], method, alpha, before,
+                    after)
+    return _direct(g_n, fs, t, method, alpha, before, after)
+
+
+def reconstruction_snr(g_true, g_rec):
+    """Relação sinal/erro de reconstrução (dB)."""
+    g_true = np.asarray(g_true)
+    err = np.asarray(g_rec) - g_true
+    return 10 * np.log10(np.mean(g_true**2) / (np.mean(err**2) + 1e-30))
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Gera figuras de quantização para os slides de Conversão Analógico-Digital.
-Saída: ../quantization_*.pdf,  ../sqnr_vs_bits.pdf
+Saída: ../quantization_*.pdf,  ../sqnr_vs_bits.pdf,  ../lloyd_max_sqnr.pdf
 
 Uso: python gen_quantization_figures.py
 """
@@ -10,6 +10,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 
+from _lloyd_max import design_from_data, quantize
+from _quantization import companded_quantize, quantize_uniform
+
 plt.rcParams.update({
     'font.size': 11,
     'font.family': 'serif',
@@ -31,19 +34,6 @@ UNB_GOLD  = '#F2A900'
 RED       = '#C0392B'
 
 
-# ---------------------------------------------------------------------------
-# Quantizador Uniforme
-# ---------------------------------------------------------------------------
-def quantize_uniform(x, n_bits, v_min=-1.0, v_max=1.0):
-    """Quantizador uniforme — saída = ponto médio do intervalo."""
-    L     = 2**n_bits
-    delta = (v_max - v_min) / L
-    x_c   = np.clip(x, v_min, v_max - 1e-12)
-    idx   = np.floor((x_c - v_min) / delta).astype(int)
-    idx   = np.clip(idx, 0, L - 1)
-    return v_min + (idx + 0.5) * delta
-
-
 # ===========================================================================
 # Figura 1: Característica do quantizador + sinal quantizado
 # ===========================================================================
@@ -258,10 +248,53 @@ def gen_quantization_resolution():
     print("  [OK] quantization_resolution.pdf")
 
 
+# ===========================================================================
+# Figura 5: Lloyd–Max vs. uniforme vs. μ-law (sinal Laplaciano)
+# ===========================================================================
+def gen_lloyd_max_sqnr():
+    # Modelo de fala: Laplaciana com σ = 0,25 (carga de ±4σ na faixa ±1)
+    rng = np.random.default_rng(7)
+    g   = np.clip(rng.laplace(scale=0.25/np.sqrt(2), size=1_000_000), -1, 1)
+    g_sorted = np.sort(g)
+    P_s = np.mean(g**2)
+
+    n_vals  = np.arange(2, 13)
+    sqnr    = {'uniform': [], 'mu': [], 'lloyd': []}
+    for n in n_vals:
+        for law in ('uniform', 'mu'):
+            g_q = companded_quantize(g, int(n), law)
+            sqnr[law].append(10 * np.log10(P_s / np.mean((g_q - g)**2)))
+        q = design_from_data(g_sorted, int(n), presorted=True)
+        sqnr['lloyd'].append(10 * np.log10(P_s / np.mean((quantize(g, q) - g)**2)))
+
+    fig, ax = plt.subplots(figsize=(9, 5.5))
+
+    ax.plot(n_vals, sqnr['uniform'], color=UNB_BLUE,  lw=2.5, marker='o', ms=6,
+            label='Uniforme')
+    ax.plot(n_vals, sqnr['mu'],      color=RED,       lw=2.5, ls='--',
+            marker='s', ms=6, label=r'$\mu$-law  ($\mu = 255$)')
+    ax.plot(n_vals, sqnr['lloyd'],   color=UNB_GREEN, lw=2.5, marker='^',
+            ms=7, label='Lloyd–Max (projetado nos dados)')
+
+    ax.set_xlabel('Número de bits $n$', fontsize=13)
+    ax.set_ylabel('SQNR (dB)',           fontsize=13)
+    ax.set_title('SQNR vs. Número de Bits  —  Sinal Laplaciano ($\\sigma = 0{,}25$)',
+                 fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.set_xticks(n_vals)
+    ax.set_xlim([1.5, 12.5])
+
+    plt.tight_layout()
+    plt.savefig('../lloyd_max_sqnr.pdf', bbox_inches='tight')
+    plt.close()
+    print("  [OK] lloyd_max_sqnr.pdf")
+
+
 if __name__ == '__main__':
     print("Gerando figuras de quantização...")
     gen_quantization_illustration()
     gen_quantization_error_pdf()
     gen_sqnr_vs_bits()
     gen_quantization_resolution()
+    gen_lloyd_max_sqnr()
     print("Concluído!\n")
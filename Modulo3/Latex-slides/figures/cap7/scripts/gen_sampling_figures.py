@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Gera figuras de amostragem para os slides de Conversão Analógico-Digital.
-Saída: ../sampling_time_domain.pdf, ../sampling_spectrum.pdf, ../aliasing_demo.pdf
+Saída: ../sampling_time_domain.pdf, ../sampling_spectrum.pdf, ../aliasing_demo.pdf,
+       ../reconstruction_error.pdf
 
 Uso: python gen_sampling_figures.py
 """
@@ -10,6 +11,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
+from _reconstruction import reconstruct, reconstruction_snr
+
 # ---------------------------------------------------------------------------
 # Configurações de estilo (compatível com LaTeX)
 # ---------------------------------------------------------------------------
@@ -238,9 +241,77 @@ def gen_aliasing_demo():
     print("  [OK] aliasing_demo.pdf")
 
 
+# ===========================================================================
+# Figura 4: Reconstrução — ZOH, cosseno levantado e sinc
+# ===========================================================================
+def gen_reconstruction_error():
+    f_sig = 800     # Hz — mesmo tom de gen_aliasing_demo
+    T     = 0.05    # s  — registro; o erro é medido na metade central
+    L     = 16      # pontos de reconstrução por período de amostragem
+    methods = [('zoh',  'Segurador de ordem zero', UNB_GOLD,  '-'),
+               ('rc',   r'Cosseno levantado ($\alpha = 0{,}25$)', UNB_GREEN, '--'),
+               ('sinc', 'Sinc (ideal)',            UNB_BLUE,  '-')]
+
+    def tone(t):
+        return np.cos(2*np.pi * f_sig * t)
+
+    def reconstruct_tone(fs, method):
+        n   = np.arange(int(T * fs))
+        t_r = np.arange(len(n) * L) / (L * fs)   # grade Ts/L → caminho FFT
+        return t_r, reconstruct(tone(n / fs), fs, t_r, method)
+
+    fig, axes = plt.subplots(2, 1, figsize=(9, 7))
+
+    # ---- (a) Reconstrução com f_s = 2500 Hz ----
+    ax = axes[0]
+    fs_demo = 2500
+    t_fine  = np.linspace(0.02, 0.026, 2000)
+    ax.plot(t_fine*1000, tone(t_fine), color='gray', lw=3, alpha=0.35,
+            label=rf'$g(t) = \cos(2\pi\cdot{f_sig}\,t)$')
+    for method, label, color, ls in methods:
+        t_r, g_r = reconstruct_tone(fs_demo, method)
+        sel = (t_r >= t_fine[0]) & (t_r <= t_fine[-1])
+        ax.plot(t_r[sel]*1000, g_r[sel], color=color, lw=1.8, ls=ls, label=label)
+    t_n = np.arange(int(T * fs_demo)) / fs_demo
+    sel = (t_n >= t_fine[0]) & (t_n <= t_fine[-1])
+    ax.plot(t_n[sel]*1000, tone(t_n[sel]), 'o', color='k', ms=6,
+            label='Amostras')
+    ax.set_title(rf'(a) Reconstrução a partir de $f_s = {fs_demo}$ Hz',
+                 fontweight='bold')
+    ax.set_xlabel('Tempo (ms)', fontsize=12)
+    ax.set_ylabel('Amplitude',  fontsize=12)
+    ax.legend(fontsize=9, ncol=3, loc='lower center')
+    ax.set_xlim([t_fine[0]*1000, t_fine[-1]*1000])
+    ax.set_ylim([-1.6, 1.3])
+
+    # ---- (b) Erro de reconstrução vs. sobreamostragem ----
+    ax = axes[1]
+    factors = np.geomspace(0.6, 16, 40)          # f_s / (2 f_sig)
+    for method, label, color, ls in methods:
+        snr = []
+        for factor in factors:
+            t_r, g_r = reconstruct_tone(2 * f_sig * factor, method)
+            mid = (t_r > T/4) & (t_r < 3*T/4)
+            snr.append(reconstruction_snr(tone(t_r[mid]), g_r[mid]))
+        ax.semilogx(factors, snr, color=color, lw=2.2, ls=ls, label=label)
+    ax.axvline(1, color=RED, ls=':', lw=1.8, label=r'Nyquist ($f_s = 2f$)')
+    ax.set_title('(b) SNR de reconstrução vs. fator de sobreamostragem',
+                 fontweight='bold')
+    ax.set_xlabel(r'$f_s / (2 f)$', fontsize=12)
+    ax.set_ylabel('SNR (dB)',       fontsize=12)
+    ax.legend(fontsize=9)
+    ax.set_xlim([factors[0], factors[-1]])
+
+    plt.tight_layout()
+    plt.savefig('../reconstruction_error.pdf', bbox_inches='tight')
+    plt.close()
+    print("  [OK] reconstruction_error.pdf")
+
+
 if __name__ == '__main__':
     print("Gerando figuras de amostragem...")
     gen_sampling_time_domain()
     gen_sampling_spectrum()
     gen_aliasing_demo()
+    gen_reconstruction_error()
     print("Concluído!\n")
@@ -3,113 +3,1157 @@
 generate_all_figures.py
 
 Script para gerar todas as figuras dos slides dos módulos.
-Executa todos os scripts Python encontrados em Modulo*/Code/cap*/scripts/
+Executa todos os scripts de figuras registrados em curso_pricom.toml
+(chave figure_scripts de cada [modules.*]).
 
 Uso:
-    python generate_all_figures.py
+    python generate_all_figures.py            # execução serial
+    python generate_all_figures.py --jobs 8   # até 8 scripts em paralelo
+    python generate_all_figures.py --jobs 0   # um worker por núcleo
+    python generate_all_figures.py --force    # ignora o cache incremental
+    python generate_all_figures.py --runner inprocess --jobs 4
+    python generate_all_figures.py --list     # lista scripts e saídas
+    python generate_all_figures.py eye_diagram_4pam.pdf fm_bessel_functions
+    python generate_all_figures.py --manifest figures_manifest.json
+
+Com --jobs > 1, scripts cujo bloco __main__ apenas chama funções gen_*
+em sequência são divididos em uma tarefa por função, para que o tempo
+total seja ditado pela figura mais lenta e não pela soma das figuras de
+um script (--no-split desativa).
+
+Com --profile RELATORIO.json|.csv cada tarefa é instrumentada: tempo de
+parede, tempo de CPU, pico de memória residente e divisão entre cálculo
+e renderização (savefig). O relatório é gravado no arquivo e as --top N
+tarefas mais lentas são exibidas ao final; --cprofile DIR grava também um
+perfil cProfile (.prof) por tarefa.
+
+Figuras passadas como argumento (nome do arquivo, com ou sem extensão, ou
+caminho relativo à raiz) são geradas individualmente: apenas o script que
+as produz roda e, em scripts com várias funções gen_*, apenas a função que
+chama o savefig correspondente.
+
+Tarefas cujo fingerprint (código-fonte, módulos auxiliares locais que ele
+importa e versões fixadas em curso_pricom.toml) e arquivos de saída não
+mudaram desde a última execução bem-sucedida são puladas. O estado fica
+em .figures_cache.json na raiz do projeto: uma entrada por arquivo gerado
+e uma por tarefa (script ou script::função) concluída com sucesso.
+
+Com --runner inprocess os scripts não ganham um interpretador novo cada:
+rodam em workers persistentes que já importaram numpy, scipy.signal e
+matplotlib.pyplot uma única vez. Cada script executa num namespace novo,
+no seu próprio diretório, com rcParams restaurados, figuras fechadas e
+gerador aleatório re-semeado.
 """
 
+import io
 import os
 import sys
+import ast
+import csv
+import json
+import time
+import cProfile
+import tempfile
+import signal
+import random
+import difflib
+import hashlib
+import argparse
+import builtins
+import warnings
+import traceback
+import sysconfig
 import subprocess
+import multiprocessing
+from collections import namedtuple
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
 # Diretório raiz do projeto
 PROJECT_ROOT = Path(__file__).parent.absolute()
 
-# Padrão dos diretórios de scripts
-SCRIPTS_PATTERN = "Modulo*/Code/cap*/scripts/*.py"
+# Padrão dos scripts de um módulo sem figure_scripts no curso_pricom.toml
+# (relativo ao diretório de código do módulo)
+DEFAULT_SCRIPTS_PATTERN = "cap*/scripts/*.py"
+
+# Tempo máximo de execução de cada script (segundos)
+SCRIPT_TIMEOUT = 300
+
+# Variável de ambiente com os processos que cada tarefa pode usar
+# internamente (núcleos / --jobs), para não multiplicar pools aninhados
+TASK_JOBS_ENV = "PRICOM_TASK_JOBS"
+
+# Configuração do projeto e cache do build incremental
+CONFIG_FILE = PROJECT_ROOT / "curso_pricom.toml"
+CACHE_FILE = PROJECT_ROOT / ".figures_cache.json"
+CACHE_VERSION = 3
+
+# Bibliotecas pré-carregadas pelos workers do runner "inprocess"
+PRELOAD_MODULES = ["numpy", "scipy.signal", "matplotlib", "matplotlib.pyplot"]
+
+
+def load_project_config():
+    """Lê curso_pricom.toml (dicionário vazio se o arquivo não existir)."""
+    if not CONFIG_FILE.exists():
+        return {}
+    with open(CONFIG_FILE, "rb") as f:
+        return tomllib.load(f)
+
+
+def _parse_source(path):
+    """Retorna a AST de um arquivo Python (None se não for analisável)."""
+    try:
+        return ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def find_output_functions(script_path):
+    """
+    Extrai os arquivos gerados por um script a partir das chamadas
+    savefig('...') com caminho literal e mapeia cada um à função de nível
+    superior que o salva (None para código no nível do módulo). Os
+    caminhos são resolvidos em relação ao diretório do script, que é o cwd
+    durante a execução.
+    """
+    tree = _parse_source(script_path)
+    if tree is None:
+        return {}
+
+    functions = {}
+    for stmt in tree.body:
+        owner = stmt.name if isinstance(stmt, ast.FunctionDef) else None
+        for node in ast.walk(stmt):
+            if not (isinstance(node, ast.Call)
+                    and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == "savefig"
+                    and node.args):
+                continue
+            target = node.args[0]
+            if isinstance(target, ast.Constant) and isinstance(target.value, str):
+                path = (script_path.parent / target.value).resolve()
+                functions.setdefault(path, owner)
+    return functions
+
+
+def _is_main_guard(node):
+    """Reconhece `if __name__ == '__main__':`."""
+    test = node.test if isinstance(node, ast.If) else None
+    return (isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name)
+            and test.left.id == "__name__"
+            and len(test.comparators) == 1
+            and isinstance(test.comparators[0], ast.Constant)
+            and test.comparators[0].value == "__main__")
+
+
+def find_main_functions(script_path):
+    """
+    Funções chamadas, em ordem, pelo bloco __main__ de um script.
 
+    Retorna None se o bloco faz qualquer outra coisa além de chamar
+    funções do próprio script sem argumentos (e imprimir mensagens), ou
+    se o script também gera figuras no nível do módulo: nesses casos as
+    funções não podem ser executadas isoladamente com segurança.
+    """
+    tree = _parse_source(script_path)
+    if tree is None:
+        return None
 
-def find_figure_scripts():
+    defined = {stmt.name for stmt in tree.body
+               if isinstance(stmt, ast.FunctionDef)}
+    guards = [stmt for stmt in tree.body if _is_main_guard(stmt)]
+    if len(guards) != 1 or guards[0].orelse:
+        return None
+    if None in find_output_functions(script_path).values():
+        return None
+
+    functions = []
+    for stmt in guards[0].body:
+        call = stmt.value if isinstance(stmt, ast.Expr) else None
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name)):
+            return None
+        if call.func.id == "print":
+            continue
+        if call.func.id not in defined or call.args or call.keywords:
+            return None
+        functions.append(call.func.id)
+    return functions or None
+
+
+def find_script_outputs(script_path):
+    """Lista ordenada dos arquivos gerados por um script."""
+    return sorted(find_output_functions(script_path))
+
+
+# Entrada do registro de geradores: módulo do curso, caminho do script,
+# arquivos que ele declara gerar (via savefig), para cada arquivo a função
+# gen_* que o produz (None para código no nível do módulo) e as funções
+# chamadas pelo bloco __main__ (None se o script não pode ser dividido)
+FigureScript = namedtuple("FigureScript",
+                          ["module", "path", "outputs", "functions",
+                           "main_functions"])
+
+# Unidade de execução: um script inteiro (function=None) ou uma única
+# função de figura dele, com as saídas correspondentes
+FigureTask = namedtuple("FigureTask", ["script", "function", "outputs"])
+
+
+def _module_script_patterns(name, module, structure):
+    """Padrões glob (relativos à raiz) dos scripts de um módulo."""
+    if "figure_scripts" in module:
+        return list(module["figure_scripts"])
+    code_dir = module.get(
+        "code", f"{module.get('root', name)}/"
+                f"{structure.get('module_code_dir', 'Code')}")
+    return [f"{code_dir}/{DEFAULT_SCRIPTS_PATTERN}"]
+
+
+def build_registry(config=None):
+    """
+    Monta o registro de todos os geradores de figuras do curso.
+
+    Os módulos e os padrões de scripts vêm de curso_pricom.toml; arquivos
+    iniciados por "_" são módulos auxiliares e ficam de fora. Cada entrada
+    registra as saídas declaradas pelo script, para que o escalonador e o
+    cache enxerguem o grafo completo de figuras.
+    """
+    if config is None:
+        config = load_project_config()
+    structure = config.get("structure", {})
+
+    registry = {}
+    for name, module in config.get("modules", {}).items():
+        for pattern in _module_script_patterns(name, module, structure):
+            for path in PROJECT_ROOT.glob(pattern):
+                if (path.suffix != ".py" or path.name.startswith("_")
+                        or not path.is_file() or path in registry):
+                    continue
+                functions = find_output_functions(path)
+                registry[path] = FigureScript(
+                    name, path, sorted(functions), functions,
+                    find_main_functions(path))
+
+    return [registry[path] for path in sorted(registry)]
+
+
+def find_figure_scripts(config=None):
     """Encontra todos os scripts de geração de figuras."""
-    scripts = []
-    for modulo_dir in PROJECT_ROOT.glob("Modulo*"):
-        if not modulo_dir.is_dir():
+    return [entry.path for entry in build_registry(config)]
+
+
+def build_manifest(registry):
+    """
+    Manifesto das figuras: caminho relativo de cada saída -> módulo,
+    script e função geradora.
+    """
+    manifest = {}
+    for entry in registry:
+        for output in entry.outputs:
+            manifest[str(output.relative_to(PROJECT_ROOT))] = {
+                "module": entry.module,
+                "script": str(entry.path.relative_to(PROJECT_ROOT)),
+                "function": entry.functions[output],
+            }
+    return manifest
+
+
+def _matches_target(path, target):
+    """Uma figura casa com o caminho relativo, o nome ou o nome sem extensão."""
+    return target in (str(path.relative_to(PROJECT_ROOT)), path.name, path.stem)
+
+
+def select_tasks(registry, targets):
+    """
+    Converte figuras pedidas pelo nome em tarefas mínimas.
+
+    Figuras geradas dentro de uma função gen_* viram tarefas daquela
+    função apenas; figuras de scripts sem funções (ou o próprio nome do
+    script) exigem o script inteiro. Retorna (tarefas, alvos desconhecidos).
+    """
+    wanted = {}
+    unknown = []
+    for target in targets:
+        found = False
+        for entry in registry:
+            if _matches_target(entry.path, target):
+                wanted.setdefault(entry.path, set()).add(None)
+                found = True
+            for output in entry.outputs:
+                if _matches_target(output, target):
+                    wanted.setdefault(entry.path, set()).add(
+                        entry.functions[output])
+                    found = True
+        if not found:
+            unknown.append(target)
+
+    tasks = []
+    for entry in registry:
+        functions = wanted.get(entry.path)
+        if not functions:
             continue
-        
-        code_dir = modulo_dir / "Code"
-        if not code_dir.exists():
+        if None in functions:
+            tasks.append(FigureTask(entry.path, None, entry.outputs))
             continue
-        
-        for cap_dir in code_dir.glob("cap*"):
-            if not cap_dir.is_dir():
-                continue
-            
-            scripts_dir = cap_dir / "scripts"
-            if not scripts_dir.exists():
-                continue
-            
-            for script in scripts_dir.glob("*.py"):
-                # Ignorar README e __pycache__
-                if script.name != "README.md" and not script.name.startswith("_"):
-                    scripts.append(script)
-    
-    return sorted(scripts)
+        for function in sorted(functions):
+            outputs = [output for output in entry.outputs
+                       if entry.functions[output] == function]
+            tasks.append(FigureTask(entry.path, function, outputs))
+    return tasks, unknown
 
 
-def run_script(script_path):
-    """Executa um script Python e retorna True se bem-sucedido."""
-    print(f"\n{'='*70}")
-    print(f"Gerando figuras: {script_path.relative_to(PROJECT_ROOT)}")
-    print(f"{'='*70}")
-    
+def script_tasks(entry, split=False):
+    """
+    Tarefas de um script inteiro: uma só, ou, com split=True e se o bloco
+    __main__ permitir, uma por função na ordem em que ele as chama.
+    """
+    if not split or not entry.main_functions:
+        return [FigureTask(entry.path, None, entry.outputs)]
+    return [
+        FigureTask(entry.path, function,
+                   [output for output in entry.outputs
+                    if entry.functions[output] == function])
+        for function in entry.main_functions
+    ]
+
+
+def task_name(task):
+    """Nome curto de uma tarefa: script.py ou script.py::função."""
+    if task.function is None:
+        return task.script.name
+    return f"{task.script.name}::{task.function}"
+
+
+def _local_module_files(name, search_dirs):
+    """
+    Resolve um nome de módulo (a.b.c) para arquivos do projeto: o próprio
+    módulo e os __init__.py dos pacotes no caminho. Módulos fora dos
+    diretórios de busca (numpy, scipy, stdlib...) resultam em lista vazia.
+    """
+    parts = name.split(".")
+    for base in search_dirs:
+        files = []
+        for i in range(1, len(parts)):
+            init = base.joinpath(*parts[:i], "__init__.py")
+            if not init.is_file():
+                break
+            files.append(init)
+        else:
+            module = base.joinpath(*parts)
+            if module.with_suffix(".py").is_file():
+                return files + [module.with_suffix(".py")]
+            if (module / "__init__.py").is_file():
+                return files + [module / "__init__.py"]
+    return []
+
+
+def find_local_imports(script_path):
+    """
+    Retorna os módulos auxiliares do projeto importados (direta ou
+    transitivamente) por um script, procurando no diretório do script e
+    na raiz do projeto.
+    """
+    found = set()
+    pending = [script_path.resolve()]
+    while pending:
+        path = pending.pop()
+        tree = _parse_source(path)
+        if tree is None:
+            continue
+
+        search_dirs = [path.parent, PROJECT_ROOT]
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.extend((alias.name, search_dirs) for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    # Import relativo: resolve a partir do pacote do arquivo
+                    base = path.parent
+                    for _ in range(node.level - 1):
+                        base = base.parent
+                    dirs = [base]
+                else:
+                    dirs = search_dirs
+                prefix = f"{node.module}." if node.module else ""
+                modules = [prefix + alias.name for alias in node.names]
+                if node.module:
+                    modules.append(node.module)
+                names.extend((module, dirs) for module in modules)
+
+        for module, dirs in names:
+            for f in _local_module_files(module, dirs):
+                if f not in found:
+                    found.add(f)
+                    pending.append(f)
+
+    found.discard(script_path.resolve())
+    return sorted(found)
+
+
+def file_digest(path):
+    """SHA-256 do conteúdo de um arquivo."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def script_fingerprint(script_path, config):
+    """
+    Fingerprint das entradas de um script: código-fonte, módulos
+    auxiliares locais importados, versão do interpretador em uso e a
+    seção [python] de curso_pricom.toml (interpretador e pacotes fixados).
+    """
+    h = hashlib.sha256()
+    h.update(f"cache-v{CACHE_VERSION}\n".encode())
+    h.update(sys.version.encode())
+    h.update(json.dumps(config.get("python", {}), sort_keys=True).encode())
+    for path in [script_path.resolve()] + find_local_imports(script_path):
+        h.update(str(path.relative_to(PROJECT_ROOT)).encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+def load_cache():
+    """
+    Carrega o cache do build incremental (vazio se inválido):
+    {"outputs": {saída: registro}, "tasks": {tarefa: registro}}.
+    """
+    empty = {"outputs": {}, "tasks": {}}
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=script_path.parent,
-            capture_output=False,
-            timeout=300  # 5 minutos por script
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if cache.get("version") != CACHE_VERSION:
+        return empty
+    return {"outputs": cache.get("outputs", {}),
+            "tasks": cache.get("tasks", {})}
+
+
+def save_cache(cache):
+    """Grava o cache do build incremental."""
+    data = {"version": CACHE_VERSION, **cache}
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    tmp.replace(CACHE_FILE)
+
+
+def _task_key(task):
+    """Chave de uma tarefa no cache: script relativo, com ::função."""
+    key = str(task.script.relative_to(PROJECT_ROOT))
+    return key if task.function is None else f"{key}::{task.function}"
+
+
+def is_up_to_date(task, fingerprint, cache):
+    """
+    Uma tarefa está atualizada se a última execução dela (ou do script
+    inteiro, para uma tarefa de função) terminou com sucesso com o
+    fingerprint atual, e se todas as suas saídas existem com o conteúdo
+    registrado. Uma execução que falhou depois de gravar parte das saídas
+    apaga o registro da tarefa, então não conta. Tarefas sem saídas
+    detectáveis nunca são puladas.
+    """
+    if not task.outputs:
+        return False
+    keys = [_task_key(task)]
+    if task.function is not None:
+        keys.append(str(task.script.relative_to(PROJECT_ROOT)))
+    if not any(cache["tasks"].get(key, {}).get("fingerprint") == fingerprint
+               for key in keys):
+        return False
+    for output in task.outputs:
+        entry = cache["outputs"].get(str(output.relative_to(PROJECT_ROOT)))
+        if (not entry or entry.get("fingerprint") != fingerprint
+                or not output.exists()
+                or file_digest(output) != entry.get("digest")):
+            return False
+    return True
+
+
+def record_build(task, fingerprint, cache):
+    """Registra no cache a tarefa e as saídas de uma execução bem-sucedida."""
+    cache["tasks"][_task_key(task)] = {"fingerprint": fingerprint}
+    for output in task.outputs:
+        key = str(output.relative_to(PROJECT_ROOT))
+        if output.exists():
+            cache["outputs"][key] = {"fingerprint": fingerprint,
+                                     "digest": file_digest(output)}
+        else:
+            cache["outputs"].pop(key, None)
+
+
+def forget_build(task, cache):
+    """
+    Remove do cache uma tarefa que falhou e as suas saídas. A falha de uma
+    função invalida também o registro do script inteiro; a do script
+    inteiro, o de todas as suas funções.
+    """
+    script_key = str(task.script.relative_to(PROJECT_ROOT))
+    for key in list(cache["tasks"]):
+        if (key == _task_key(task) or key == script_key
+                or (task.function is None
+                    and key.startswith(f"{script_key}::"))):
+            del cache["tasks"][key]
+    for output in task.outputs:
+        cache["outputs"].pop(str(output.relative_to(PROJECT_ROOT)), None)
+
+
+def _banner(task):
+    """Cabeçalho impresso antes da saída de cada tarefa."""
+    label = str(task.script.relative_to(PROJECT_ROOT))
+    if task.function is not None:
+        label += f"::{task.function}"
+    return (f"\n{'='*70}\n"
+            f"Gerando figuras: {label}\n"
+            f"{'='*70}")
+
+
+def _exec_figure_code(script_path, function=None):
+    """
+    Executa o código de um script num namespace novo. Sem `function` ele
+    roda como __main__; com `function` o script é carregado como módulo
+    (o bloco if __name__ == '__main__' não roda) e apenas a função
+    indicada é chamada.
+    """
+    namespace = {
+        "__name__": "__main__" if function is None else "__figure__",
+        "__file__": str(script_path),
+        "__builtins__": builtins,
+    }
+    code = compile(script_path.read_bytes(), str(script_path), "exec")
+    exec(code, namespace)
+    if function is not None:
+        namespace[function]()
+
+
+def _reset_peak_rss():
+    """Zera o pico de memória residente do processo (somente Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mib():
+    """
+    Pico de memória residente do processo em MiB. No Linux usa VmHWM, que
+    _reset_peak_rss zera entre tarefas de um mesmo worker; nas demais
+    plataformas cai para ru_maxrss (pico desde o início do processo).
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure_task(script_path, function, metrics, cprofile_path=None):
+    """
+    Executa uma tarefa (ver _exec_figure_code) instrumentada, preenchendo
+    `metrics` com tempo de execução, tempo de CPU, tempo gasto dentro de
+    Figure.savefig (renderização), o restante (cálculo) e o pico de
+    memória residente. As métricas são preenchidas mesmo se o script
+    falhar; a exceção é propagada. Com cprofile_path, grava também o
+    perfil cProfile da execução.
+    """
+    import matplotlib.figure
+
+    savefig = matplotlib.figure.Figure.savefig
+    render_time = [0.0]
+
+    def timed_savefig(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return savefig(self, *args, **kwargs)
+        finally:
+            render_time[0] += time.perf_counter() - start
+
+    profiler = cProfile.Profile() if cprofile_path else None
+    matplotlib.figure.Figure.savefig = timed_savefig
+    _reset_peak_rss()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        _exec_figure_code(script_path, function)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        exec_time = time.perf_counter() - wall_start
+        matplotlib.figure.Figure.savefig = savefig
+        metrics.update(
+            exec_s=exec_time,
+            cpu_s=time.process_time() - cpu_start,
+            savefig_s=render_time[0],
+            compute_s=exec_time - render_time[0],
+            peak_rss_mib=_peak_rss_mib(),
         )
-        
+        if profiler is not None:
+            profiler.dump_stats(cprofile_path)
+            metrics["cprofile"] = str(cprofile_path)
+
+
+def _child_main(script, function, metrics_path, cprofile_path):
+    """
+    Ponto de entrada do subprocesso iniciado por _task_command. Argumentos
+    vazios significam "não se aplica" (script inteiro, sem instrumentação).
+    """
+    script_path = Path(script)
+    sys.argv = [script]
+    if not metrics_path:
+        _exec_figure_code(script_path, function or None)
+        return
+    metrics = {}
+    try:
+        measure_task(script_path, function or None, metrics,
+                     cprofile_path or None)
+    finally:
+        Path(metrics_path).write_text(json.dumps(metrics), encoding="utf-8")
+
+
+# Bootstrap do subprocesso para funções isoladas e execuções
+# instrumentadas. O diretório do script continua em sys.path[0] (cwd),
+# como em `python script.py`; a raiz do projeto entra logo depois.
+_RUN_TASK = (
+    "import sys; sys.path.insert(1, sys.argv[1]); "
+    "from generate_all_figures import _child_main; "
+    "_child_main(*sys.argv[2:])"
+)
+
+
+def _task_command(task, metrics_path=None, cprofile_path=None):
+    """Linha de comando do subprocesso que executa uma tarefa."""
+    if task.function is None and metrics_path is None:
+        return [sys.executable, str(task.script)]
+    return [sys.executable, "-c", _RUN_TASK, str(PROJECT_ROOT),
+            str(task.script), task.function or "",
+            str(metrics_path or ""), str(cprofile_path or "")]
+
+
+def _cprofile_path(task, cprofile_dir):
+    """Arquivo .prof de uma tarefa dentro de cprofile_dir."""
+    if cprofile_dir is None:
+        return None
+    rel = task.script.relative_to(PROJECT_ROOT).with_suffix("")
+    name = "__".join(rel.parts)
+    if task.function is not None:
+        name += f".{task.function}"
+    return Path(cprofile_dir).resolve() / f"{name}.prof"
+
+
+def run_task(task, capture_output=False, profile=False, cprofile_dir=None):
+    """
+    Executa uma tarefa num subprocesso e retorna (sucesso, log, métricas).
+
+    Com capture_output=True nada é impresso: a saída do script e as
+    mensagens de status são acumuladas em `log`, para que execuções
+    paralelas possam ser exibidas em ordem. Caso contrário, tudo vai
+    direto para o terminal e `log` é vazio.
+
+    Com profile=True a tarefa roda instrumentada (ver measure_task) e
+    `métricas` traz também o tempo de parede visto daqui, incluindo a
+    partida do interpretador; caso contrário é None.
+    """
+    lines = []
+    emit = lines.append if capture_output else print
+
+    name = task_name(task)
+    emit(_banner(task))
+
+    # Backend não interativo: scripts em paralelo não devem abrir janelas
+    env = dict(os.environ, MPLBACKEND="Agg")
+
+    metrics_path = None
+    if profile:
+        fd, metrics_path = tempfile.mkstemp(prefix="figure-metrics-",
+                                            suffix=".json")
+        os.close(fd)
+    command = _task_command(task, metrics_path,
+                            _cprofile_path(task, cprofile_dir))
+    start = time.perf_counter()
+
+    try:
+        if capture_output:
+            result = subprocess.run(
+                command,
+                cwd=task.script.parent,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=SCRIPT_TIMEOUT
+            )
+            if result.stdout:
+                emit(result.stdout.rstrip())
+        else:
+            result = subprocess.run(
+                command,
+                cwd=task.script.parent,
+                env=env,
+                timeout=SCRIPT_TIMEOUT
+            )
+
         if result.returncode == 0:
-            print(f"✓ Sucesso: {script_path.name}")
-            return True
+            emit(f"✓ Sucesso: {name}")
+            ok = True
         else:
-            print(f"✗ Erro: {script_path.name} (código {result.returncode})")
-            return False
+            emit(f"✗ Erro: {name} (código {result.returncode})")
+            ok = False
     except subprocess.TimeoutExpired:
-        print(f"✗ Timeout: {script_path.name} demorou mais de 5 minutos")
-        return False
+        emit(f"✗ Timeout: {name} demorou mais de "
+             f"{SCRIPT_TIMEOUT // 60} minutos")
+        ok = False
     except Exception as e:
-        print(f"✗ Exceção: {script_path.name}\n{e}")
+        emit(f"✗ Exceção: {name}\n{e}")
+        ok = False
+
+    metrics = None
+    if profile:
+        metrics = {"wall_s": time.perf_counter() - start}
+        try:
+            metrics.update(json.loads(
+                Path(metrics_path).read_text(encoding="utf-8") or "{}"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            os.unlink(metrics_path)
+
+    return ok, "\n".join(lines), metrics
+
+
+def _init_worker():
+    """Inicializa um worker persistente do runner "inprocess"."""
+    os.environ["MPLBACKEND"] = "Agg"
+    for name in PRELOAD_MODULES:
+        __import__(name)
+
+
+def _alarm_handler(signum, frame):
+    raise TimeoutError
+
+
+def _installed_dirs():
+    """Diretórios do interpretador e de site-packages (venv incluso)."""
+    paths = sysconfig.get_paths()
+    dirs = {sys.prefix, sys.base_prefix, sys.exec_prefix,
+            paths["purelib"], paths["platlib"]}
+    return [Path(d).resolve() for d in dirs]
+
+
+def _is_under(path, base):
+    """path está dentro de base (Path.is_relative_to só existe no 3.9+)."""
+    try:
+        path.relative_to(base)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_project_module(module_file, installed_dirs):
+    """
+    Módulo do projeto (a descarregar após cada tarefa): arquivo sob
+    PROJECT_ROOT mas fora do interpretador e dos site-packages — o .venv
+    configurado em curso_pricom.toml fica dentro da raiz do projeto.
+    """
+    path = Path(module_file).resolve()
+    if any(_is_under(path, d) for d in installed_dirs):
         return False
+    return _is_under(path, PROJECT_ROOT)
 
 
-def main():
+def run_task_inprocess(task, profile=False, cprofile_dir=None):
+    """
+    Executa uma tarefa dentro do worker atual e retorna (sucesso, log,
+    métricas); as métricas seguem run_task.
+
+    O código roda num namespace novo (ver _exec_figure_code), com cwd,
+    sys.path e sys.argv equivalentes aos de `python script.py`. Antes de cada script
+    os rcParams voltam ao padrão e os geradores aleatórios são re-semeados
+    com entropia nova (como num interpretador recém-iniciado); depois dele
+    as figuras abertas são fechadas e os módulos do projeto importados
+    pelo script são descarregados, para não vazar estado para o próximo.
+    """
+    import numpy as np
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    script_path = task.script
+    name = task_name(task)
+    buffer = io.StringIO()
+    print(_banner(task), file=buffer)
+
+    saved_cwd = os.getcwd()
+    saved_path = list(sys.path)
+    saved_argv = list(sys.argv)
+    saved_modules = set(sys.modules)
+    saved_np_err = np.geterr()
+
+    matplotlib.rc_file_defaults()
+    np.random.seed()
+    random.seed()
+
+    metrics = {} if profile else None
+    use_alarm = hasattr(signal, "SIGALRM")
+    try:
+        os.chdir(script_path.parent)
+        sys.path.insert(0, str(script_path.parent))
+        sys.argv = [str(script_path)]
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _alarm_handler)
+            signal.alarm(SCRIPT_TIMEOUT)
+        with redirect_stdout(buffer), redirect_stderr(buffer), \
+                warnings.catch_warnings():
+            if profile:
+                measure_task(script_path, task.function, metrics,
+                             _cprofile_path(task, cprofile_dir))
+            else:
+                _exec_figure_code(script_path, task.function)
+        print(f"✓ Sucesso: {name}", file=buffer)
+        ok = True
+    except SystemExit as e:
+        ok = e.code in (None, 0)
+        if ok:
+            print(f"✓ Sucesso: {name}", file=buffer)
+        else:
+            print(f"✗ Erro: {name} (código {e.code})", file=buffer)
+    except TimeoutError:
+        print(f"✗ Timeout: {name} demorou mais de "
+              f"{SCRIPT_TIMEOUT // 60} minutos", file=buffer)
+        ok = False
+    except Exception:
+        print(traceback.format_exc().rstrip(), file=buffer)
+        print(f"✗ Exceção: {name}", file=buffer)
+        ok = False
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+        plt.close("all")
+        np.seterr(**saved_np_err)
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        installed = _installed_dirs()
+        for module_name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[module_name], "__file__", None)
+            if module_file and _is_project_module(module_file, installed):
+                del sys.modules[module_name]
+
+    if metrics:
+        metrics["wall_s"] = metrics["exec_s"]
+    return ok, buffer.getvalue().rstrip(), metrics
+
+
+def make_worker_pool(jobs):
+    """
+    Cria o pool de workers persistentes do runner "inprocess".
+
+    Com forkserver (Linux) as bibliotecas são importadas uma única vez no
+    servidor e herdadas por cada worker via fork; nas demais plataformas
+    cada worker as importa uma vez ao iniciar.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn")
+    if ctx.get_start_method() == "forkserver":
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=ctx,
+                               initializer=_init_worker)
+
+
+def run_tasks(tasks, jobs=1, runner="subprocess", profile=False,
+              cprofile_dir=None):
+    """
+    Executa as tarefas e gera (tarefa, sucesso, métricas) na ordem da
+    lista; profile e cprofile_dir seguem run_task.
+
+    runner="subprocess": um interpretador novo por tarefa. Com jobs > 1
+    as tarefas rodam em paralelo num pool limitado de workers; cada
+    subprocesso é independente, então threads bastam para despachá-los.
+
+    runner="inprocess": as tarefas rodam em `jobs` workers persistentes
+    (ver run_task_inprocess), pagando o custo de importação uma vez.
+
+    Em execução paralela ou "inprocess", a saída de cada tarefa é
+    capturada e impressa assim que ela e todas as anteriores terminam.
+
+    Os núcleos são repartidos entre os workers: TASK_JOBS_ENV, herdada
+    por subprocessos e workers, diz quantos processos cada tarefa pode
+    abrir (1 quando há tantos workers quanto núcleos).
+    """
+    os.environ[TASK_JOBS_ENV] = str(max(1, (os.cpu_count() or 1)
+                                        // max(jobs, 1)))
+    if runner == "inprocess":
+        pool = make_worker_pool(max(jobs, 1))
+        submit = lambda task: pool.submit(run_task_inprocess, task,
+                                          profile, cprofile_dir)
+    elif jobs > 1:
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        submit = lambda task: pool.submit(run_task, task, True,
+                                          profile, cprofile_dir)
+    else:
+        for task in tasks:
+            ok, _, metrics = run_task(task, False, profile, cprofile_dir)
+            yield task, ok, metrics
+        return
+
+    with pool:
+        futures = [submit(task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                ok, log, metrics = future.result()
+            except Exception as e:
+                ok, log, metrics = False, (f"{_banner(task)}\n"
+                                           f"✗ Exceção: {task_name(task)}"
+                                           f"\n{e}"), None
+            print(log, flush=True)
+            yield task, ok, metrics
+
+
+# Colunas do relatório de desempenho (--profile)
+PROFILE_FIELDS = ["task", "script", "function", "ok", "wall_s", "exec_s",
+                  "cpu_s", "compute_s", "savefig_s", "peak_rss_mib",
+                  "cprofile"]
+
+
+def profile_row(task, ok, metrics):
+    """Linha do relatório de desempenho de uma tarefa."""
+    row = dict.fromkeys(PROFILE_FIELDS)
+    row.update(metrics or {})
+    row.update(
+        task=task_name(task),
+        script=str(task.script.relative_to(PROJECT_ROOT)),
+        function=task.function,
+        ok=ok,
+    )
+    return row
+
+
+def write_profile_report(rows, path):
+    """Grava o relatório em JSON ou CSV, conforme a extensão do arquivo."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+def print_profile_table(rows, top):
+    """Imprime as `top` tarefas mais lentas (tempo de parede)."""
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    ranked = sorted(rows, key=lambda row: row["wall_s"] or 0.0, reverse=True)
+    print(f"\nTOP {min(top, len(ranked))} TAREFAS MAIS LENTAS:")
+    print(f"  {'parede':>8} {'CPU':>8} {'cálculo':>8} {'savefig':>8} "
+          f"{'RSS MiB':>8}  tarefa")
+    for row in ranked[:top]:
+        print(f"  {fmt(row['wall_s'], '8.2f')} {fmt(row['cpu_s'], '8.2f')} "
+              f"{fmt(row['compute_s'], '8.2f')} "
+              f"{fmt(row['savefig_s'], '8.2f')} "
+              f"{fmt(row['peak_rss_mib'], '8.1f')}  {row['task']}")
+
+
+def parse_args(argv=None):
+    """Interpreta os argumentos de linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Gera todas as figuras dos slides dos módulos.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="número de tarefas executadas em paralelo "
+             "(padrão: 1; 0 = número de núcleos)")
+    parser.add_argument(
+        "--no-split", action="store_true",
+        help="com --jobs > 1, não dividir scripts em uma tarefa por "
+             "função gen_*")
+    parser.add_argument(
+        "-f", "--force", action="store_true",
+        help="executa todos os scripts, ignorando o cache incremental")
+    parser.add_argument(
+        "--runner", choices=["subprocess", "inprocess"], default="subprocess",
+        help="subprocess: um interpretador por script (padrão); "
+             "inprocess: workers persistentes com numpy/scipy/matplotlib "
+             "pré-carregados")
+    parser.add_argument(
+        "--list", action="store_true",
+        help="lista os scripts registrados e suas saídas, sem executar")
+    parser.add_argument(
+        "--manifest", nargs="?", const="-", metavar="ARQUIVO",
+        help="grava o manifesto saída -> script/função em JSON "
+             "(stdout se ARQUIVO for omitido) e sai")
+    parser.add_argument(
+        "--profile", metavar="RELATORIO",
+        help="instrumenta cada tarefa e grava o relatório em JSON ou CSV "
+             "(conforme a extensão); combine com --force para medir tudo")
+    parser.add_argument(
+        "--top", type=int, default=10, metavar="N",
+        help="quantas tarefas mais lentas exibir com --profile/--cprofile "
+             "(padrão: 10)")
+    parser.add_argument(
+        "--cprofile", metavar="DIR",
+        help="grava um perfil cProfile (.prof) por tarefa em DIR")
+    parser.add_argument(
+        "figures", nargs="*", metavar="FIGURA",
+        help="gera apenas estas figuras (ex.: eye_diagram_4pam.pdf, "
+             "fm_bessel_functions); padrão: todas")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs deve ser >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv=None):
     """Função principal."""
+    args = parse_args(argv)
+
+    config = load_project_config()
+    registry = build_registry(config)
+
+    if args.manifest:
+        text = json.dumps(build_manifest(registry), indent=2,
+                          ensure_ascii=False)
+        if args.manifest == "-":
+            print(text)
+        else:
+            Path(args.manifest).write_text(text + "\n", encoding="utf-8")
+        return 0
+
     print("\n" + "="*70)
     print("GERADOR DE FIGURAS - CURSO PRICOM")
     print("="*70)
     
-    scripts = find_figure_scripts()
-    
-    if not scripts:
+    if not registry:
         print("\n⚠ Nenhum script de geração de figuras encontrado.")
-        print("   Verifique a estrutura: Modulo*/Code/cap*/scripts/*.py")
+        print(f"   Verifique as chaves figure_scripts de [modules.*] em "
+              f"{CONFIG_FILE.name}")
         return 1
     
-    print(f"\nEncontrados {len(scripts)} script(s) de geração:\n")
-    for script in scripts:
-        print(f"  - {script.relative_to(PROJECT_ROOT)}")
-    
-    # Executar scripts
+    if args.figures:
+        tasks, unknown = select_tasks(registry, args.figures)
+        if unknown:
+            known = [output.name for entry in registry
+                     for output in entry.outputs]
+            print("\n⚠ Figura(s) desconhecida(s):")
+            for target in unknown:
+                hint = difflib.get_close_matches(target, known, n=3)
+                suffix = f"  (quis dizer: {', '.join(hint)}?)" if hint else ""
+                print(f"   - {target}{suffix}")
+            return 1
+        print(f"\nSelecionada(s) {len(tasks)} tarefa(s) para "
+              f"{len(args.figures)} figura(s):\n")
+        for task in tasks:
+            print(f"  - {task.script.relative_to(PROJECT_ROOT)}"
+                  + (f"::{task.function}" if task.function else ""))
+    else:
+        split = args.jobs > 1 and not args.no_split
+        tasks = [task for entry in registry
+                 for task in script_tasks(entry, split)]
+        print(f"\nEncontrados {len(registry)} script(s) de geração:\n")
+        for entry in registry:
+            print(f"  - [{entry.module}] "
+                  f"{entry.path.relative_to(PROJECT_ROOT)}")
+            if args.list:
+                for output in entry.outputs:
+                    function = entry.functions[output]
+                    print(f"      → {output.relative_to(PROJECT_ROOT)}"
+                          + (f"  ({function})" if function else ""))
+        if len(tasks) > len(registry):
+            print(f"\nDivididos em {len(tasks)} tarefa(s) independentes "
+                  f"(uma por função gen_*)")
+
+    if args.list:
+        n_outputs = sum(len(task.outputs) for task in tasks)
+        print(f"\nTotal: {n_outputs} arquivo(s) de saída declarado(s)\n")
+        return 0
+
+    # Build incremental: pular tarefas cujas entradas e saídas não mudaram
+    cache = load_cache()
+    fingerprints = {script: script_fingerprint(script, config)
+                    for script in {task.script for task in tasks}}
+    pending = [task for task in tasks
+               if args.force
+               or not is_up_to_date(task, fingerprints[task.script], cache)]
+    cached = len(tasks) - len(pending)
+    if cached:
+        print(f"\n{cached} tarefa(s) atualizada(s), pulando (use --force "
+              f"para regenerar):")
+        for task in tasks:
+            if task not in pending:
+                print(f"  ↷ {task_name(task)}")
+
+    jobs = min(args.jobs, len(pending))
+    if args.runner == "inprocess" and pending:
+        print(f"\nExecutando em {max(jobs, 1)} worker(s) persistente(s)")
+    elif jobs > 1:
+        print(f"\nExecutando com {jobs} workers em paralelo")
+
+    profile = bool(args.profile or args.cprofile)
+    if args.cprofile:
+        Path(args.cprofile).mkdir(parents=True, exist_ok=True)
+
+    # Executar tarefas
     successful = 0
     failed = 0
+    rows = []
     
-    for script in scripts:
-        if run_script(script):
-            successful += 1
-        else:
-            failed += 1
+    try:
+        for task, ok, metrics in run_tasks(pending, jobs, args.runner,
+                                           profile, args.cprofile):
+            if profile:
+                rows.append(profile_row(task, ok, metrics))
+            if ok:
+                successful += 1
+                record_build(task, fingerprints[task.script], cache)
+            else:
+                failed += 1
+                forget_build(task, cache)
+    finally:
+        save_cache(cache)
     
     # Resumo
     print(f"\n{'='*70}")
     print(f"RESUMO:")
     print(f"  ✓ Sucesso: {successful}")
     print(f"  ✗ Falhas: {failed}")
-    print(f"  Total: {len(scripts)}")
+    print(f"  ↷ Em cache: {cached}")
+    print(f"  Total: {len(tasks)}")
     print(f"{'='*70}\n")
+
+    if rows:
+        print_profile_table(rows, args.top)
+        if args.profile:
+            write_profile_report(rows, args.profile)
+            print(f"\nRelatório de desempenho: {args.profile}")
+        if args.cprofile:
+            print(f"Perfis cProfile: {args.cprofile}")
+        print()
     
     return 0 if failed == 0 else 1
 